@@ -5,7 +5,16 @@ A high-performance web-based interface for managing RDP connections and window p
 """
 
 import os
+import gzip
+import hashlib
 import json
+import re
+import socket
+import struct
+import itertools
+import select
+import selectors
+import shutil
 import subprocess
 import threading
 import time
@@ -13,15 +22,33 @@ import yaml
 import logging
 import asyncio
 import concurrent.futures
+from collections import defaultdict, deque
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Tuple
-from dataclasses import dataclass, asdict
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Any, Tuple
+from dataclasses import dataclass, field, fields
 from functools import lru_cache, wraps
-from flask import Flask, render_template, request, jsonify, abort
+from flask import Flask, Response, render_template, request, jsonify, abort
+from flask.json.provider import JSONProvider
 from flask_socketio import SocketIO, emit
-import psutil
+import orjson
 from colorama import Fore, Style
 
+try:  # Optional: query systemd over D-Bus instead of running systemctl
+    from jeepney import DBusAddress, new_method_call
+    from jeepney.io.blocking import open_dbus_connection
+    from jeepney.wrappers import unwrap_msg
+    _SYSTEMD_MANAGER = DBusAddress('/org/freedesktop/systemd1', bus_name='org.freedesktop.systemd1',
+                                   interface='org.freedesktop.systemd1.Manager')
+except ImportError:
+    open_dbus_connection = None
+
+try:  # Optional: zstd content-encoding for clients that accept it, gzip otherwise
+    import zstandard
+    _ZSTD = zstandard.ZstdCompressor(level=3)
+except ImportError:
+    _ZSTD = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -33,25 +60,99 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson, so jsonify() and request.get_json() skip the stdlib encoder"""
+    
+    # Same switches as Flask's DefaultJSONProvider, but off regardless of app.debug:
+    # sorted keys and indented output only cost encode time and bytes on the wire
+    sort_keys = False
+    compact = True
+    
+    @property
+    def options(self) -> int:
+        # Workspace-keyed dicts use int keys, which the stdlib encoder stringifies implicitly
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if not self.compact:
+            option |= orjson.OPT_INDENT_2
+        return option
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, option=self.options).decode()
+    
+    def loads(self, s, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+    
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        # Hand the encoded bytes straight to the response instead of round-tripping through str
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj, option=self.options), mimetype='application/json')
+
 # Performance optimizations
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'nz7dev-mission-control-2024')
-app.config['JSON_SORT_KEYS'] = False  # Disable key sorting for performance
-socketio = SocketIO(app, cors_allowed_origins="*", async_mode='threading')
+class _OrjsonPacketJSON:
+    """json-module stand-in for Socket.IO packets; python-socketio passes separators=, which orjson ignores"""
+    
+    @staticmethod
+    def dumps(obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    
+    @staticmethod
+    def loads(s, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+# Optional shared message queue (e.g. redis://localhost:6379/0) so broadcasts fan out across
+# worker processes; unset keeps the in-process manager. SOCKETIO_SERIALIZER=msgpack switches to
+# binary packets (needs the msgpack package and a msgpack-parser client)
+socketio = SocketIO(app, cors_allowed_origins="*", async_mode='threading',
+                    message_queue=os.environ.get('SOCKETIO_BROKER'),
+                    serializer=os.environ.get('SOCKETIO_SERIALIZER', 'default'),
+                    json=_OrjsonPacketJSON)
 
 # Custom log handler for WebSocket emission
 class WebSocketLogHandler(logging.Handler):
+    """Queue log records and broadcast them as one log_batch event per flush interval"""
+    
+    FLUSH_INTERVAL = 0.1  # seconds
+    
+    def __init__(self, level=logging.NOTSET):
+        super().__init__(level)
+        self._pending = deque()
+        self._flusher_started = False
+    
     def emit(self, record):
         try:
-            log_data = {
+            self._pending.append({
                 'message': record.getMessage(),
                 'level': record.levelname,
                 'timestamp': datetime.fromtimestamp(record.created).isoformat(),
                 'logger': record.name
-            }
-            socketio.emit('log_message', log_data)
+            })
+            if not self._flusher_started:
+                self._flusher_started = True
+                socketio.start_background_task(self._flush_loop)
         except Exception:
             pass  # Silently ignore errors in log emission
+    
+    def _flush_loop(self):
+        """Send everything queued since the last tick in a single broadcast"""
+        while True:
+            socketio.sleep(self.FLUSH_INTERVAL)
+            if not self._pending:
+                continue
+            batch = []
+            try:
+                while True:
+                    batch.append(self._pending.popleft())
+            except IndexError:
+                pass
+            try:
+                socketio.emit('log_batch', batch)
+            except Exception:
+                pass  # Silently ignore errors in log emission
 
 # Add WebSocket handler to logger
 websocket_handler = WebSocketLogHandler()
@@ -59,7 +160,11 @@ websocket_handler.setLevel(logging.INFO)
 logger.addHandler(websocket_handler)
 
 # Configuration Management
-@dataclass
+# libyaml C bindings when PyYAML was built with them, pure-Python otherwise
+_YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+_YamlDumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+@dataclass(frozen=True, slots=True)
 class VMConfig:
     """VM Configuration with validation"""
     callsign: str
@@ -82,11 +187,20 @@ class VMConfig:
     
     @staticmethod
     def _is_valid_ip(ip: str) -> bool:
-        """Basic IP validation"""
-        parts = ip.split('.')
-        return len(parts) == 4 and all(part.isdigit() and 0 <= int(part) <= 255 for part in parts)
+        """Basic IP validation - strict dotted-quad IPv4 parsed in C"""
+        try:
+            socket.inet_pton(socket.AF_INET, ip)
+            return True
+        except (OSError, TypeError):
+            return False
+
+_VM_FIELDS = tuple(f.name for f in fields(VMConfig))
+
+def _vm_to_dict(vm_config: VMConfig) -> Dict[str, Any]:
+    """Shallow dict of a VMConfig - all fields are scalars, so asdict's deepcopy is unnecessary"""
+    return {name: getattr(vm_config, name) for name in _VM_FIELDS}
 
-@dataclass
+@dataclass(slots=True)
 class ConnectionInfo:
     """RDP Connection tracking"""
     connection_id: str
@@ -99,6 +213,10 @@ class ConnectionInfo:
     started: datetime
     last_checked: Optional[datetime] = None
     status: str = 'running'
+    alive: bool = True  # Cleared by RDPManager's exit watcher, the only writer
+    # Last 16 chunks (up to 4KB each) of client output, kept for exit diagnostics
+    stdout_tail: deque = field(default_factory=lambda: deque(maxlen=16))
+    stderr_tail: deque = field(default_factory=lambda: deque(maxlen=16))
 
 class ConfigManager:
     """Centralized configuration management"""
@@ -108,6 +226,11 @@ class ConfigManager:
         self.config_file = os.path.join(self.config_dir, 'mission.yaml')
         self.script_path = './nz7dev'
         self._fleet_config = self._load_fleet_config()
+        self._serialized_lock = threading.Lock()
+        self._serialized = None  # Cached JSON bytes of the fleet config, rebuilt on change
+        self._serialized_gzip = None
+        self._fleet_columns = None  # Cached (names, ips, static status fields) parallel tuples
+        self._vm_dicts: Dict[str, Dict[str, Any]] = {}  # Per-VM plain dicts, dropped when a VM is updated
     
     def _load_fleet_config(self) -> Dict[str, VMConfig]:
         """Load and validate fleet configuration"""
@@ -123,7 +246,7 @@ class ConfigManager:
         try:
             if os.path.exists(self.config_file):
                 with open(self.config_file, 'r') as f:
-                    data = yaml.safe_load(f)
+                    data = yaml.load(f, Loader=_YamlLoader)
                     # TODO: Parse from YAML and create VMConfig objects
                     return default_config
             return default_config
@@ -135,15 +258,72 @@ class ConfigManager:
     def fleet_config(self) -> Dict[str, VMConfig]:
         return self._fleet_config
     
+    @property
+    def fleet_columns(self) -> Tuple[Tuple[str, ...], Tuple[str, ...], Tuple[Dict[str, Any], ...]]:
+        """Fleet as parallel (names, ips, static status fields) tuples, rebuilt after config changes"""
+        columns = self._fleet_columns
+        if columns is None:
+            items = self._fleet_config.items()
+            columns = (
+                tuple(name for name, _ in items),
+                tuple(vm_config.ip for _, vm_config in items),
+                tuple({
+                    'name': name,
+                    'callsign': vm_config.callsign,
+                    'ip': vm_config.ip,
+                    'geometry': vm_config.geometry,
+                    'workspace': vm_config.workspace,
+                    'position': vm_config.position,
+                    'scratchpad': vm_config.scratchpad,
+                    'enabled': vm_config.enabled
+                } for name, vm_config in items)
+            )
+            self._fleet_columns = columns
+        return columns
+    
+    @property
+    def serialized_config(self) -> bytes:
+        """Fleet configuration as cached JSON bytes"""
+        if self._serialized is None:
+            self._rebuild_serialized()
+        return self._serialized
+    
+    @property
+    def serialized_config_gzip(self) -> bytes:
+        """Gzip-compressed copy of serialized_config"""
+        if self._serialized_gzip is None:
+            self._rebuild_serialized()
+        return self._serialized_gzip
+    
+    def get_vm_dict(self, vm_name: str) -> Dict[str, Any]:
+        """Plain dict of one VM's configuration, built once per config change"""
+        vm_dict = self._vm_dicts.get(vm_name)
+        if vm_dict is None:
+            vm_dict = self._vm_dicts[vm_name] = _vm_to_dict(self._fleet_config[vm_name])
+        return vm_dict
+    
+    def _rebuild_serialized(self):
+        """Re-encode the fleet configuration into the JSON and gzip caches"""
+        with self._serialized_lock:
+            serialized = orjson.dumps(
+                {name: self.get_vm_dict(name) for name in self._fleet_config}
+            )
+            # Level 1: payload is compressed once and served many times
+            self._serialized_gzip = gzip.compress(serialized, compresslevel=1)
+            self._serialized = serialized
+    
     def update_vm_config(self, vm_name: str, updates: Dict[str, Any]) -> bool:
         """Update VM configuration with validation"""
         if vm_name not in self._fleet_config:
             return False
         
         try:
-            current = asdict(self._fleet_config[vm_name])
+            current = dict(self.get_vm_dict(vm_name))
             current.update(updates)
             self._fleet_config[vm_name] = VMConfig(**current)
+            self._vm_dicts.pop(vm_name, None)
+            self._fleet_columns = None
+            self._rebuild_serialized()
             return self.save_config()
         except Exception as e:
             logger.error(f"Failed to update config for {vm_name}: {e}")
@@ -177,49 +357,115 @@ class ConfigManager:
                 }
             
             with open(self.config_file, 'w') as f:
-                yaml.dump(yaml_config, f, default_flow_style=False)
+                yaml.dump(yaml_config, f, Dumper=_YamlDumper, default_flow_style=False)
             return True
         except Exception as e:
             logger.error(f"Failed to save config: {e}")
             return False
 
+def _icmp_checksum(data: bytes) -> int:
+    """RFC 1071 one's-complement checksum"""
+    if len(data) % 2:
+        data += b'\x00'
+    total = sum(struct.unpack(f'!{len(data) // 2}H', data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+def _icmp_echo_packet(ident: int, seq: int, payload: bytes = b'nz7dev-ping-probe') -> bytes:
+    """Build an ICMP echo request (type 8) with a valid checksum"""
+    header = struct.pack('!BBHHH', 8, 0, 0, ident, seq)
+    checksum = _icmp_checksum(header + payload)
+    return struct.pack('!BBHHH', 8, 0, checksum, ident, seq) + payload
+
 class NetworkOptimizer:
     """Optimized network operations with caching and connection pooling"""
     
+    RDP_PORT = 3389
+    
     def __init__(self):
         self._ping_cache = {}
         self._cache_duration = timedelta(seconds=10)  # Cache ping results for 10 seconds
-        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=10)
+        self._icmp_available = True  # Cleared if unprivileged ICMP sockets are not permitted
+        self._icmp_seq = itertools.count(1)
     
-    def ping_target(self, ip: str, timeout: int = 1) -> bool:
-        """Optimized ping with caching"""
-        now = datetime.now()
-        
-        # Check cache first
-        if ip in self._ping_cache:
-            cached_time, cached_result = self._ping_cache[ip]
-            if now - cached_time < self._cache_duration:
-                return cached_result
+    def _icmp_probe_many(self, ips: List[str], timeout: float = 1.0) -> set:
+        """Echo every IP from one ICMP socket and collect replies with select, returns the IPs that answered"""
+        if not self._icmp_available or not ips:
+            return set()
+        try:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP)
+        except OSError:
+            logger.info("Unprivileged ICMP not permitted, using TCP probes only")
+            self._icmp_available = False
+            return set()
         
-        # Perform ping
+        alive = set()
+        with sock:
+            sock.setblocking(False)
+            # The kernel rewrites the identifier and only delivers replies for this socket
+            expected = {}  # seq -> ip
+            for ip in ips:
+                seq = next(self._icmp_seq) & 0xFFFF
+                try:
+                    sock.sendto(_icmp_echo_packet(0, seq), (ip, 0))
+                    expected[seq] = ip
+                except OSError:
+                    pass  # Unroutable - counts as down
+            
+            deadline = time.monotonic() + timeout
+            while expected:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not select.select([sock], [], [], remaining)[0]:
+                    break
+                try:
+                    data, _ = sock.recvfrom(1024)
+                except OSError:
+                    continue
+                if len(data) >= 8 and data[0] == 0:
+                    ip = expected.pop(struct.unpack('!H', data[6:8])[0], None)
+                    if ip is not None:
+                        alive.add(ip)
+        return alive
+    
+    async def _tcp_probe_async(self, ip: str, port: int = RDP_PORT, timeout: float = 1.0) -> bool:
+        """TCP connect probe - a refused connection still proves the host is up"""
         try:
-            result = subprocess.run(
-                ['ping', '-c', '1', '-W', str(timeout), ip],
-                capture_output=True,
-                timeout=timeout + 0.5,  # Slightly longer timeout for subprocess
-                text=True
-            )
-            is_alive = result.returncode == 0
-            self._ping_cache[ip] = (now, is_alive)
-            return is_alive
-        except (subprocess.TimeoutExpired, subprocess.CalledProcessError):
-            self._ping_cache[ip] = (now, False)
+            _, writer = await asyncio.wait_for(asyncio.open_connection(ip, port), timeout)
+        except ConnectionRefusedError:
+            return True
+        except (OSError, asyncio.TimeoutError):
             return False
+        writer.close()
+        return True
+    
+    async def _tcp_probe_all(self, ips: List[str], timeout: float) -> List[bool]:
+        return await asyncio.gather(*(self._tcp_probe_async(ip, timeout=timeout) for ip in ips))
     
-    def ping_multiple(self, ips: List[str]) -> Dict[str, bool]:
-        """Ping multiple IPs concurrently"""
-        futures = {ip: self._executor.submit(self.ping_target, ip) for ip in ips}
-        return {ip: future.result() for ip, future in futures.items()}
+    def ping_multiple(self, ips: List[str], timeout: int = 1) -> Dict[str, bool]:
+        """Probe multiple IPs concurrently - all TCP probes share one event loop"""
+        now = datetime.now()
+        results = {}
+        pending = []
+        for ip in ips:
+            cached = self._ping_cache.get(ip)
+            if cached and now - cached[0] < self._cache_duration:
+                results[ip] = cached[1]
+            else:
+                pending.append(ip)
+        
+        if pending:
+            # TCP probes share one event loop; whatever fails gets one batched ICMP sweep
+            half_timeout = timeout / 2
+            tcp_alive = asyncio.run(self._tcp_probe_all(pending, half_timeout))
+            icmp_alive = self._icmp_probe_many([ip for ip, ok in zip(pending, tcp_alive) if not ok], half_timeout)
+            for ip, is_alive in zip(pending, tcp_alive):
+                is_alive = is_alive or ip in icmp_alive
+                self._ping_cache[ip] = (now, is_alive)
+                results[ip] = is_alive
+        
+        # Preserve the caller's ordering
+        return {ip: results[ip] for ip in ips}
     
     def cleanup_cache(self):
         """Clean expired cache entries"""
@@ -229,56 +475,237 @@ class NetworkOptimizer:
         for ip in expired:
             del self._ping_cache[ip]
 
+@lru_cache(maxsize=128)
+def _position_xy(ws_width: int, ws_height: int, width: int, height: int, position: str) -> Tuple[int, int]:
+    """Window origin for a left/center/right placement on a workspace"""
+    if position == 'center':
+        return (max(0, (ws_width - width) // 2),
+                max(40, (ws_height - height) // 2 + 40))  # Account for waybar
+    if position == 'left':
+        return (50, 90)  # Below waybar with margin
+    if position == 'right':
+        return (max(50, ws_width - width - 50), 90)
+    return (100, 100)  # Default fallback
+
+@lru_cache(maxsize=128)
+def _workspace_geometry(ws_width: int, ws_height: int, position: str) -> str:
+    """Geometry string for a window placed at position on a workspace"""
+    if position == 'left' or position == 'right':
+        # For side positions, use approximately half width, leaving some margin
+        return f"{int(ws_width * 0.48)}x{ws_height}"
+    if position == 'center':
+        # For center, use most of the screen but leave margins
+        return f"{int(ws_width * 0.9)}x{int(ws_height * 0.9)}"
+    return f"{ws_width}x{ws_height}"
+
+# Shared (never mutated) result for "no monitors", so identity-keyed layout caches still hit
+_NO_MONITORS: List[Dict[str, Any]] = []
+
 class HyprlandManager:
     """Optimized Hyprland window management with workspace resolution detection"""
     
+    # socket2 events that change the client list or the monitor/workspace layout
+    CLIENT_EVENTS = frozenset({
+        'openwindow', 'closewindow', 'movewindow', 'movewindowv2',
+        'windowtitle', 'windowtitlev2', 'changefloatingmode', 'fullscreen'
+    })
+    MONITOR_EVENTS = frozenset({
+        'monitoradded', 'monitoraddedv2', 'monitorremoved', 'configreloaded',
+        'workspace', 'workspacev2', 'focusedmon'
+    })
+    
     def __init__(self):
         self._clients_cache = None
         self._cache_time = None
         self._cache_duration = timedelta(seconds=2)  # Cache clients for 2 seconds
+        self._client_titles = ()  # Titles of the cached clients, rebuilt on refresh
+        self._exact_titles = frozenset()
         self._monitors_cache = None
         self._monitors_cache_time = None
         self._monitors_cache_duration = timedelta(seconds=30)  # Cache monitors for 30 seconds
+        self._ws_resolution_cache = (None, {}, {})  # (monitors list, {workspace: resolution}, {(workspace, position): geometry})
+        self._resolutions_payload = (None, b'')  # (monitors list, /api/workspace/resolutions JSON bytes)
+        self._workspace_state = None  # Last get_workspace_state() result
+        self._workspace_state_payload = None  # (state, JSON bytes, gzip bytes, etag) of the API response
+        self._workspace_state_time = 0.0  # time.monotonic() when it was built
+        self._workspace_state_dirty = True  # Set by invalidations and socket2 events, cleared on rebuild
+        self._workspace_state_ttl = 1.0  # Rebuild at most this often while nothing marks it dirty
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=4)  # Concurrent hyprctl queries
+        self._socket_path = None  # Hyprland request socket, resolved lazily
+        # Prebuilt hyprctl argv for the socket fallback path
+        self._query_argv = {query: ('hyprctl', query, '-j')
+                            for query in ('clients', 'monitors', 'workspaces', 'activeworkspace')}
+        self._events_active = False  # True while socket2 events keep the caches fresh
+        self._client_event = threading.Condition()  # Notified on every client socket2 event
+        self._client_event_seq = 0
+        self._start_event_listener()
+    
+    @staticmethod
+    def _find_hypr_socket(name: str) -> Optional[str]:
+        """Locate a Hyprland socket (.socket.sock or .socket2.sock) for this session"""
+        signature = os.environ.get('HYPRLAND_INSTANCE_SIGNATURE')
+        if not signature:
+            return None
+        
+        runtime_dir = os.environ.get('XDG_RUNTIME_DIR', f'/run/user/{os.getuid()}')
+        # Hyprland >= 0.40 uses $XDG_RUNTIME_DIR/hypr, older releases /tmp/hypr
+        for base_dir in (os.path.join(runtime_dir, 'hypr'), '/tmp/hypr'):
+            path = os.path.join(base_dir, signature, name)
+            if os.path.exists(path):
+                return path
+        return None
+    
+    def _find_socket_path(self) -> Optional[str]:
+        """Locate and remember the Hyprland request socket"""
+        self._socket_path = self._find_hypr_socket('.socket.sock')
+        return self._socket_path
+    
+    def _start_event_listener(self):
+        """Start the socket2 event listener when running inside a Hyprland session"""
+        if not os.environ.get('HYPRLAND_INSTANCE_SIGNATURE'):
+            logger.info("HYPRLAND_INSTANCE_SIGNATURE not set - Hyprland caches use time-based expiry")
+            return
+        threading.Thread(target=self._hypr_event_listener, daemon=True).start()
     
-    @lru_cache(maxsize=16)
-    def _get_cached_monitors(self, timestamp: float) -> str:
-        """Cache hyprctl monitors output"""
+    def _hypr_event_listener(self):
+        """Invalidate caches on Hyprland socket2 events instead of expiring them on a timer"""
+        while True:
+            path = self._find_hypr_socket('.socket2.sock')
+            if path:
+                try:
+                    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                        sock.connect(path)
+                        # Drop anything cached before we started listening
+                        self.invalidate_workspace_cache()
+                        self._events_active = True
+                        logger.info("Hyprland event listener connected - caches are event-driven")
+                        for line in sock.makefile('rb'):
+                            self._handle_hypr_event(line.split(b'>>', 1)[0].decode('ascii', errors='ignore'))
+                except OSError as e:
+                    logger.warning(f"Hyprland event socket error: {e}")
+            
+            # Fall back to time-based expiry until the event socket is back
+            self._events_active = False
+            time.sleep(5)
+    
+    def _handle_hypr_event(self, event: str):
+        """Drop the caches affected by a single socket2 event"""
+        if event in self.CLIENT_EVENTS:
+            self._clients_cache = None
+            self._workspace_state_dirty = True
+            with self._client_event:
+                self._client_event_seq += 1
+                self._client_event.notify_all()
+        elif event in self.MONITOR_EVENTS:
+            self._monitors_cache = None
+            self._workspace_state_dirty = True
+    
+    def _hypr_ipc(self, command: str, timeout: float = 3) -> Optional[bytes]:
+        """Send a request straight to the Hyprland socket, None if the socket is unavailable"""
+        path = self._socket_path or self._find_socket_path()
+        if not path:
+            return None
+        
         try:
-            result = subprocess.run(
-                ['hyprctl', 'monitors', '-j'],
-                capture_output=True,
-                text=True,
-                timeout=3
-            )
-            return result.stdout if result.returncode == 0 else ""
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(timeout)
+                sock.connect(path)
+                sock.sendall(command.encode())
+                # Hyprland closes the connection after writing the reply
+                chunks = []
+                while True:
+                    chunk = sock.recv(65536)
+                    if not chunk:
+                        break
+                    chunks.append(chunk)
+            return b''.join(chunks)
+        except OSError as e:
+            logger.debug(f"Hyprland socket request '{command}' failed, falling back to hyprctl: {e}")
+            self._socket_path = None
+            return None
+    
+    def _hyprctl_json(self, query: str, timeout: float) -> bytes:
+        """Run a JSON query over the Hyprland socket, falling back to the hyprctl binary"""
+        reply = self._hypr_ipc(f'j/{query}', timeout)
+        if reply is not None:
+            return reply
+        
+        # Raw bytes go straight to orjson, no text decode needed
+        argv = self._query_argv.get(query) or ('hyprctl', query, '-j')
+        result = subprocess.run(argv, capture_output=True, timeout=timeout)
+        return result.stdout if result.returncode == 0 else b""
+    
+    def _hypr_dispatch_batch(self, commands: List[str], timeout: float = 5) -> bool:
+        """Run several dispatchers in one Hyprland batch request, True if all replied ok"""
+        batch = ' ; '.join(f'dispatch {cmd}' for cmd in commands)
+        reply = self._hypr_ipc(f'[[BATCH]]{batch}', timeout)
+        if reply is not None:
+            output = reply
+        else:
+            result = subprocess.run(('hyprctl', '--batch', batch), capture_output=True, timeout=timeout)
+            if result.returncode != 0:
+                logger.warning(f"hyprctl batch failed: {result.stderr.decode(errors='replace').strip()}")
+                return False
+            output = result.stdout
+        
+        # Hyprland answers "ok" per dispatcher; anything else is an error message
+        if output.replace(b'ok', b'').strip():
+            logger.warning(f"Hyprland batch reported errors: {output.decode(errors='replace').strip()}")
+            return False
+        return True
+    
+    def _fetch_monitors(self) -> bytes:
+        """Fetch raw monitors JSON from Hyprland"""
+        try:
+            return self._hyprctl_json('monitors', timeout=3)
         except subprocess.TimeoutExpired:
             logger.warning("hyprctl monitors timed out")
-            return ""
+            return b""
     
     def get_monitors(self) -> List[Dict[str, Any]]:
         """Get Hyprland monitors with caching"""
         now = datetime.now()
         
+        # With the event listener connected the cache is only dropped by socket2 events
         if (self._monitors_cache is None or 
             self._monitors_cache_time is None or 
-            now - self._monitors_cache_time > self._monitors_cache_duration):
+            (not self._events_active and
+             now - self._monitors_cache_time > self._monitors_cache_duration)):
             
-            timestamp = time.time()
-            monitors_json = self._get_cached_monitors(timestamp)
+            monitors_json = self._fetch_monitors()
             
             try:
-                self._monitors_cache = json.loads(monitors_json) if monitors_json else []
+                self._monitors_cache = orjson.loads(monitors_json) if monitors_json else _NO_MONITORS
                 self._monitors_cache_time = now
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 logger.error("Failed to parse hyprctl monitors JSON")
-                self._monitors_cache = []
+                self._monitors_cache = _NO_MONITORS
+                self._monitors_cache_time = None
         
-        return self._monitors_cache or []
+        # Always the cached list itself: layout caches are keyed on its identity
+        return self._monitors_cache
     
     def get_workspace_resolution(self, workspace: int) -> Tuple[int, int]:
         """Get resolution for specific workspace with waybar compensation"""
+        monitors, resolutions, _ = self._layout_caches()
+        resolution = resolutions.get(workspace)
+        if resolution is None:
+            resolution = resolutions[workspace] = self._resolve_workspace_resolution(monitors, workspace)
+        return resolution
+    
+    def _layout_caches(self) -> Tuple[List[Dict[str, Any]], Dict[int, Tuple[int, int]], Dict[Tuple[int, str], str]]:
+        """Per-layout resolution and geometry caches, reset whenever the monitors list is refreshed"""
         monitors = self.get_monitors()
         
+        # Entries stay valid for as long as the same monitors list is cached; monitor
+        # socket2 events drop that list, so a layout change starts from empty caches
+        cache = self._ws_resolution_cache
+        if cache[0] is not monitors:
+            cache = self._ws_resolution_cache = (monitors, {}, {})
+        return cache
+    
+    def _resolve_workspace_resolution(self, monitors: List[Dict[str, Any]], workspace: int) -> Tuple[int, int]:
+        """Map a workspace onto its monitor and compute the usable resolution"""
         # Find monitor containing the workspace
         target_monitor = None
         for monitor in monitors:
@@ -309,13 +736,14 @@ class HyprlandManager:
         # Subtract 40px for waybar at top
         effective_height = max(height - 40, 600)  # Ensure minimum height
         
-        logger.info(f"Workspace {workspace} resolution: {width}x{effective_height} (monitor: {width}x{height} - 40px waybar)")
+        logger.debug(f"Workspace {workspace} resolution: {width}x{effective_height} (monitor: {width}x{height} - 40px waybar)")
         return (width, effective_height)
     
-    def get_all_workspace_resolutions(self) -> Dict[int, Tuple[int, int]]:
-        """Get resolutions for all workspaces 1-10"""
+    def get_all_workspace_resolutions(self, monitors: Optional[List[Dict[str, Any]]] = None) -> Dict[int, Tuple[int, int]]:
+        """Get resolutions for all workspaces 1-10, from the given monitors snapshot or a fresh one"""
         resolutions = {}
-        monitors = self.get_monitors()
+        if monitors is None:
+            monitors = self.get_monitors()
         
         if not monitors:
             # Fallback resolutions if no monitors detected
@@ -327,144 +755,156 @@ class HyprlandManager:
         # depends on Hyprland config, but we'll use intelligent defaults
         
         total_monitors = len(monitors)
-        workspaces_per_monitor = 10 // total_monitors if total_monitors > 0 else 10
+        workspaces_per_monitor = max(10 // total_monitors, 1)
+        
+        # Resolve each monitor's usable resolution once (waybar compensation)
+        monitor_res = [(m.get('width', 1920), max(m.get('height', 1080) - 40, 600)) for m in monitors]
         
         for workspace in range(1, 11):
             # Determine which monitor this workspace would typically be on
-            monitor_index = min((workspace - 1) // workspaces_per_monitor, total_monitors - 1)
-            monitor = monitors[monitor_index] if monitor_index < len(monitors) else monitors[0]
-            
-            width = monitor.get('width', 1920)
-            height = monitor.get('height', 1080)
-            effective_height = max(height - 40, 600)  # Waybar compensation
-            
-            resolutions[workspace] = (width, effective_height)
+            resolutions[workspace] = monitor_res[min((workspace - 1) // workspaces_per_monitor, total_monitors - 1)]
         
         return resolutions
     
+    def get_workspace_resolutions_payload(self) -> bytes:
+        """Workspace resolutions response as JSON bytes, re-encoded only when the monitors list changes"""
+        monitors = self.get_monitors()
+        cached_monitors, body = self._resolutions_payload
+        if cached_monitors is not monitors:
+            body = orjson.dumps({
+                'success': True,
+                'workspaces': {
+                    f'workspace_{workspace}': {
+                        'width': width,
+                        'height': height,
+                        'display_name': f'Auto-detect (WS{workspace}: {width}×{height})'
+                    }
+                    for workspace, (width, height) in self.get_all_workspace_resolutions(monitors).items()
+                },
+                'default_geometry': '1920x1080'
+            })
+            self._resolutions_payload = (monitors, body)
+        return body
+    
     def get_optimal_geometry_for_workspace(self, workspace: int, position: str = 'center') -> str:
         """Get optimal geometry string for workspace with position consideration"""
-        width, height = self.get_workspace_resolution(workspace)
-        
-        # Adjust size based on position for better window management
-        if position == 'left' or position == 'right':
-            # For side positions, use approximately half width
-            width = int(width * 0.48)  # Leave some margin
-        elif position == 'center':
-            # For center, use most of the screen but leave margins
-            width = int(width * 0.9)
-            height = int(height * 0.9)
-        
-        return f"{width}x{height}"
-
-    @lru_cache(maxsize=32)
-    def _get_cached_clients(self, timestamp: float) -> str:
-        """Cache hyprctl clients output"""
+        geometries = self._layout_caches()[2]
+        key = (workspace, position)
+        geometry = geometries.get(key)
+        if geometry is None:
+            geometry = geometries[key] = _workspace_geometry(*self.get_workspace_resolution(workspace), position)
+        return geometry
+
+    def _fetch_clients(self) -> bytes:
+        """Fetch raw clients JSON from Hyprland"""
         try:
-            result = subprocess.run(
-                ['hyprctl', 'clients', '-j'],  # JSON output for faster parsing
-                capture_output=True,
-                text=True,
-                timeout=2
-            )
-            return result.stdout if result.returncode == 0 else ""
+            return self._hyprctl_json('clients', timeout=2)  # JSON output for faster parsing
         except subprocess.TimeoutExpired:
             logger.warning("hyprctl clients timed out")
-            return ""
+            return b""
     
     def get_clients(self) -> List[Dict[str, Any]]:
         """Get hyprland clients with caching"""
         now = datetime.now()
         
+        # With the event listener connected the cache is only dropped by socket2 events
         if (self._clients_cache is None or 
             self._cache_time is None or 
-            now - self._cache_time > self._cache_duration):
+            (not self._events_active and now - self._cache_time > self._cache_duration)):
             
-            # Use timestamp for cache key to ensure fresh data
-            timestamp = time.time()
-            clients_json = self._get_cached_clients(timestamp)
+            clients_json = self._fetch_clients()
             
             try:
-                self._clients_cache = json.loads(clients_json) if clients_json else []
+                self._clients_cache = orjson.loads(clients_json) if clients_json else []
                 self._cache_time = now
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 logger.error("Failed to parse hyprctl clients JSON")
                 self._clients_cache = []
+                self._cache_time = None
+            
+            self._client_titles = tuple(client.get('title', '') for client in self._clients_cache)
+            self._exact_titles = frozenset(self._client_titles)
         
         return self._clients_cache or []
     
+    def list_window_titles(self) -> frozenset:
+        """Exact titles of all current windows from one clients snapshot"""
+        self.get_clients()
+        return self._exact_titles
+    
     def check_window_exists(self, window_title: str) -> bool:
         """Check if window exists efficiently"""
-        clients = self.get_clients()
-        return any(client.get('title', '').startswith(window_title) for client in clients)
+        self.get_clients()  # Refreshes the title index when the cache has expired
+        if window_title in self._exact_titles:
+            return True
+        return any(title.startswith(window_title) for title in self._client_titles)
+    
+    def wait_for_window(self, window_title: str, timeout: float = 5.0) -> bool:
+        """Wait until a window with this title prefix exists, woken by socket2 window events"""
+        deadline = time.monotonic() + timeout
+        while True:
+            seq = self._client_event_seq
+            if self.check_window_exists(window_title):
+                return True
+            
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            
+            if self._events_active:
+                with self._client_event:
+                    self._client_event.wait_for(lambda: self._client_event_seq != seq, remaining)
+            else:
+                # No event socket - fall back to polling
+                time.sleep(min(0.5, remaining))
+    
+    def batch_dispatch(self, commands: List[str], label: str) -> bool:
+        """Apply dispatchers for one or more windows in a single Hyprland request"""
+        try:
+            success = self._hypr_dispatch_batch(commands)
+        except subprocess.TimeoutExpired:
+            logger.warning(f"Hyprland batch timed out for {label}")
+            success = False
+        if not success:
+            logger.warning(f"Hyprland batch failed for {label}")
+        
+        # Pixel moves/resizes emit no socket2 event, so drop the client cache here
+        self._clients_cache = None
+        self._workspace_state_dirty = True
+        return success
+    
+    def position_commands(self, window_title: str, workspace: int, position: str, geometry: str) -> List[str]:
+        """Dispatchers that move a window to a workspace, size it and place it"""
+        width, height = map(int, geometry.split('x'))
+        
+        # Calculate position based on workspace resolution
+        try:
+            ws_width, ws_height = self.get_workspace_resolution(workspace)
+            x, y = _position_xy(ws_width, ws_height, width, height, position)
+            
+            logger.debug(f"Calculated position for {window_title}: {x},{y} (workspace {workspace}, {position})")
+            
+        except Exception as e:
+            logger.warning(f"Failed to calculate optimal position: {e}, using defaults")
+            x, y = 100, 100
+        
+        # Hyprland applies the batch in order within a single request
+        return [
+            f'movetoworkspacesilent {workspace},title:"{window_title}"',
+            f'resizewindowpixel exact {width} {height},title:"{window_title}"',
+            f'movewindowpixel exact {x} {y},title:"{window_title}"'
+        ]
     
     def position_window(self, window_title: str, workspace: int, position: str, geometry: str) -> bool:
         """Position window with improved commands and timing"""
         try:
-            width, height = map(int, geometry.split('x'))
-            
             # Wait for window to be ready
-            max_retries = 10
-            for attempt in range(max_retries):
-                if self.check_window_exists(window_title):
-                    break
-                time.sleep(0.5)
-            else:
-                logger.warning(f"Window {window_title} not found after {max_retries} attempts")
+            if not self.wait_for_window(window_title, timeout=5.0):
+                logger.warning(f"Window {window_title} not found after 5s")
                 return False
             
-            # Calculate position based on workspace resolution
-            try:
-                ws_width, ws_height = self.get_workspace_resolution(workspace)
-                
-                if position == 'center':
-                    x = max(0, (ws_width - width) // 2)
-                    y = max(40, (ws_height - height) // 2 + 40)  # Account for waybar
-                elif position == 'left':
-                    x = 50
-                    y = 90  # Below waybar with margin
-                elif position == 'right':
-                    x = max(50, ws_width - width - 50)
-                    y = 90
-                else:
-                    x, y = 100, 100  # Default fallback
-                    
-                logger.info(f"Calculated position for {window_title}: {x},{y} (workspace {workspace}, {position})")
-                
-            except Exception as e:
-                logger.warning(f"Failed to calculate optimal position: {e}, using defaults")
-                x, y = 100, 100
-            
-            # Execute positioning commands individually with delays for reliability
-            commands = [
-                f'movetoworkspacesilent {workspace},title:"{window_title}"',
-                f'resizewindowpixel exact {width} {height},title:"{window_title}"',
-                f'movewindowpixel exact {x} {y},title:"{window_title}"'
-            ]
-            
-            success = True
-            for i, cmd in enumerate(commands):
-                try:
-                    result = subprocess.run(['hyprctl', 'dispatch'] + cmd.split(' ', 1), 
-                                          capture_output=True, timeout=3)
-                    if result.returncode != 0:
-                        logger.warning(f"Positioning command {i+1} failed for {window_title}: {result.stderr.decode()}")
-                        success = False
-                    else:
-                        logger.debug(f"Positioning step {i+1}/3 successful for {window_title}")
-                    
-                    # Small delay between commands for reliability
-                    if i < len(commands) - 1:
-                        time.sleep(0.3)
-                        
-                except subprocess.TimeoutExpired:
-                    logger.warning(f"Positioning command {i+1} timed out for {window_title}")
-                    success = False
-                except Exception as e:
-                    logger.error(f"Error in positioning command {i+1} for {window_title}: {e}")
-                    success = False
-            
-            return success
+            return self.batch_dispatch(self.position_commands(window_title, workspace, position, geometry),
+                                       window_title)
             
         except Exception as e:
             logger.error(f"Failed to position window {window_title}: {e}")
@@ -472,41 +912,23 @@ class HyprlandManager:
 
     def get_workspace_state(self) -> Dict[str, Any]:
         """Get current state of all workspaces including VM assignments"""
+        # Invalidations only mark the state dirty, so a burst of assignments costs one rebuild
+        if (not self._workspace_state_dirty and self._workspace_state is not None and
+                time.monotonic() - self._workspace_state_time <= self._workspace_state_ttl):
+            return self._workspace_state
+        
         try:
-            clients = self.get_clients()
-            workspaces_info = self.get_workspaces_info()
-            monitors = self.get_monitors()
-            
-            workspace_state = {
-                'workspaces': {},
-                'scratchpad': {
-                    'windows': [],
-                    'visible': False
-                },
-                'monitors': []
-            }
-            
-            # Process monitors
-            for monitor in monitors:
-                workspace_state['monitors'].append({
-                    'name': monitor.get('name', 'Unknown'),
-                    'width': monitor.get('width', 1920),
-                    'height': monitor.get('height', 1080),
-                    'scale': monitor.get('scale', 1.0),
-                    'focused': monitor.get('focused', False),
-                    'active_workspace': monitor.get('activeWorkspace', {}).get('id', 1)
-                })
-            
-            # Initialize workspaces 1-10
-            for ws_id in range(1, 11):
-                workspace_state['workspaces'][str(ws_id)] = {
-                    'id': ws_id,
-                    'windows': [],
-                    'active': False,
-                    'resolution': self.get_workspace_resolution(ws_id)
-                }
-            
-            # Process clients and assign to workspaces
+            self._workspace_state_dirty = False
+            built_at = time.monotonic()
+            # Query all four hyprctl views concurrently so latency is the slowest call, not the sum
+            futures = [self._executor.submit(query) for query in (
+                self.get_clients, self.get_workspaces_info, self.get_monitors, self.get_active_workspace
+            )]
+            clients, workspaces_info, monitors, active_workspace = [future.result() for future in futures]
+            
+            # Single pass over clients, bucketing windows by workspace id
+            ws_windows = defaultdict(list)
+            scratchpad_windows = []
             for client in clients:
                 title = client.get('title', '')
                 workspace_info = client.get('workspace', {})
@@ -533,144 +955,138 @@ class HyprlandManager:
                         'fullscreen': client.get('fullscreen', False)
                     }
                 
+                window = {
+                    'title': title,
+                    'vm_info': vm_info,
+                    'client_data': client
+                }
+                
                 # Assign to workspace or scratchpad
                 if workspace_name == 'special':
-                    workspace_state['scratchpad']['windows'].append({
-                        'title': title,
-                        'vm_info': vm_info,
-                        'client_data': client
-                    })
-                elif workspace_id > 0 and workspace_id <= 10:
-                    workspace_state['workspaces'][str(workspace_id)]['windows'].append({
-                        'title': title,
-                        'vm_info': vm_info,
-                        'client_data': client
-                    })
-            
-            # Check if scratchpad is visible
-            for workspace in workspaces_info:
-                if workspace.get('name') == 'special':
-                    workspace_state['scratchpad']['visible'] = True
-                    break
+                    scratchpad_windows.append(window)
+                elif 0 < workspace_id <= 10:
+                    ws_windows[workspace_id].append(window)
             
-            # Mark active workspace
-            active_workspace = self.get_active_workspace()
-            if active_workspace and str(active_workspace) in workspace_state['workspaces']:
-                workspace_state['workspaces'][str(active_workspace)]['active'] = True
+            # Workspaces 1-10; resolutions are memoised per monitors snapshot
+            workspace_state = {
+                'workspaces': {
+                    str(ws_id): {
+                        'id': ws_id,
+                        'windows': ws_windows[ws_id],
+                        'active': ws_id == active_workspace,
+                        'resolution': self.get_workspace_resolution(ws_id)
+                    }
+                    for ws_id in range(1, 11)
+                },
+                'scratchpad': {
+                    'windows': scratchpad_windows,
+                    'visible': any(workspace.get('name') == 'special' for workspace in workspaces_info)
+                },
+                'monitors': [
+                    {
+                        'name': monitor.get('name', 'Unknown'),
+                        'width': monitor.get('width', 1920),
+                        'height': monitor.get('height', 1080),
+                        'scale': monitor.get('scale', 1.0),
+                        'focused': monitor.get('focused', False),
+                        'active_workspace': monitor.get('activeWorkspace', {}).get('id', 1)
+                    }
+                    for monitor in monitors
+                ]
+            }
             
+            self._workspace_state = workspace_state
+            self._workspace_state_time = built_at
             return workspace_state
             
         except Exception as e:
-            logger.error(f"Failed to get workspace state: {e}")
+            logger.error("Failed to get workspace state: %s", e)
+            self._workspace_state_dirty = True
             return {
                 'workspaces': {},
                 'scratchpad': {'windows': [], 'visible': False},
                 'monitors': []
             }
     
+    def get_workspace_state_payload(self) -> Tuple[bytes, bytes, str]:
+        """/api/workspaces/state response as (JSON bytes, gzip bytes, etag), encoded once per state rebuild"""
+        state = self.get_workspace_state()
+        payload = self._workspace_state_payload
+        if payload is None or payload[0] is not state:
+            body = orjson.dumps({'success': True, 'workspaces': state}, option=orjson.OPT_NON_STR_KEYS)
+            payload = (state, body, gzip.compress(body, compresslevel=1), payload_etag(body))
+            self._workspace_state_payload = payload
+        return payload[1], payload[2], payload[3]
+    
     def get_workspaces_info(self) -> List[Dict[str, Any]]:
         """Get information about all workspaces"""
         try:
-            result = subprocess.run(
-                ['hyprctl', 'workspaces', '-j'],
-                capture_output=True,
-                text=True,
-                timeout=3
-            )
-            if result.returncode == 0:
-                return json.loads(result.stdout)
-            return []
-        except (subprocess.TimeoutExpired, json.JSONDecodeError, Exception) as e:
+            output = self._hyprctl_json('workspaces', timeout=3)
+            return orjson.loads(output) if output else []
+        except (subprocess.TimeoutExpired, orjson.JSONDecodeError, Exception) as e:
             logger.warning(f"Failed to get workspaces info: {e}")
             return []
     
     def get_active_workspace(self) -> int:
         """Get currently active workspace ID"""
         try:
-            result = subprocess.run(
-                ['hyprctl', 'activeworkspace', '-j'],
-                capture_output=True,
-                text=True,
-                timeout=2
-            )
-            if result.returncode == 0:
-                data = json.loads(result.stdout)
-                return data.get('id', 1)
-            return 1
-        except (subprocess.TimeoutExpired, json.JSONDecodeError, Exception) as e:
+            output = self._hyprctl_json('activeworkspace', timeout=2)
+            return orjson.loads(output).get('id', 1) if output else 1
+        except (subprocess.TimeoutExpired, orjson.JSONDecodeError, Exception) as e:
             logger.warning(f"Failed to get active workspace: {e}")
             return 1
     
+    def scratchpad_commands(self, window_title: str, size_preset: str, position: str, geometry: str) -> List[str]:
+        """Dispatchers that move a window to the scratchpad, size it and place it"""
+        width, height = map(int, geometry.split('x'))
+        
+        # Commands for scratchpad assignment
+        commands = [
+            f'movetoworkspacesilent special,title:"{window_title}"',
+            f'resizewindowpixel exact {width} {height},title:"{window_title}"'
+        ]
+        
+        # Calculate position for scratchpad based on preset and position
+        if size_preset == 'quarter':
+            # Quarter windows get specific grid positions
+            positions = {
+                'center': (960, 540),
+                'left': (480, 540), 
+                'right': (1440, 540),
+                'top-left': (480, 270),
+                'top-right': (1440, 270),
+                'bottom-left': (480, 810),
+                'bottom-right': (1440, 810)
+            }
+            x, y = positions.get(position, positions['center'])
+        elif size_preset.startswith('half'):
+            # Half windows
+            if size_preset == 'half-left':
+                x, y = (width // 4, 70)
+            elif size_preset == 'half-right':
+                x, y = (1920 - width // 4 - width, 70)
+            else:
+                x, y = ((1920 - width) // 2, 70)
+        else:
+            # Full or other sizes - center them
+            x, y = ((1920 - width) // 2, (1080 - height) // 2)
+        
+        commands.append(f'movewindowpixel exact {x} {y},title:"{window_title}"')
+        return commands
+    
     def assign_to_scratchpad(self, window_title: str, size_preset: str, position: str, geometry: str) -> bool:
         """Assign window to scratchpad with specific size and position"""
         try:
-            width, height = map(int, geometry.split('x'))
-            
             # Wait for window to be ready
-            max_retries = 5
-            for attempt in range(max_retries):
-                if self.check_window_exists(window_title):
-                    break
-                time.sleep(0.3)
-            else:
+            if not self.wait_for_window(window_title, timeout=1.5):
                 logger.warning(f"Window {window_title} not found for scratchpad assignment")
                 return False
             
-            # Commands for scratchpad assignment
-            commands = [
-                f'movetoworkspacesilent special,title:"{window_title}"',
-                f'resizewindowpixel exact {width} {height},title:"{window_title}"'
-            ]
-            
-            # Calculate position for scratchpad based on preset and position
-            if size_preset == 'quarter':
-                # Quarter windows get specific grid positions
-                positions = {
-                    'center': (960, 540),
-                    'left': (480, 540), 
-                    'right': (1440, 540),
-                    'top-left': (480, 270),
-                    'top-right': (1440, 270),
-                    'bottom-left': (480, 810),
-                    'bottom-right': (1440, 810)
-                }
-                x, y = positions.get(position, positions['center'])
-            elif size_preset.startswith('half'):
-                # Half windows
-                if size_preset == 'half-left':
-                    x, y = (width // 4, 70)
-                elif size_preset == 'half-right':
-                    x, y = (1920 - width // 4 - width, 70)
-                else:
-                    x, y = ((1920 - width) // 2, 70)
-            else:
-                # Full or other sizes - center them
-                x, y = ((1920 - width) // 2, (1080 - height) // 2)
-            
-            commands.append(f'movewindowpixel exact {x} {y},title:"{window_title}"')
-            
-            # Execute commands
-            success = True
-            for i, cmd in enumerate(commands):
-                try:
-                    result = subprocess.run(['hyprctl', 'dispatch'] + cmd.split(' ', 1), 
-                                          capture_output=True, timeout=3)
-                    if result.returncode != 0:
-                        logger.warning(f"Scratchpad command {i+1} failed for {window_title}: {result.stderr.decode()}")
-                        success = False
-                    
-                    # Small delay between commands
-                    if i < len(commands) - 1:
-                        time.sleep(0.2)
-                        
-                except subprocess.TimeoutExpired:
-                    logger.warning(f"Scratchpad command {i+1} timed out for {window_title}")
-                    success = False
-                except Exception as e:
-                    logger.error(f"Error in scratchpad command {i+1} for {window_title}: {e}")
-                    success = False
-            
-            logger.info(f"Assigned {window_title} to scratchpad with {size_preset} size at position {x},{y}")
+            # Execute all commands as one Hyprland batch
+            success = self.batch_dispatch(self.scratchpad_commands(window_title, size_preset, position, geometry),
+                                          window_title)
+            if success:
+                logger.info(f"Assigned {window_title} to scratchpad with {size_preset} size")
             return success
             
         except Exception as e:
@@ -683,9 +1099,31 @@ class HyprlandManager:
         self._cache_time = None
         self._monitors_cache = None
         self._monitors_cache_time = None
-        # Clear LRU caches
-        self._get_cached_clients.cache_clear()
-        self._get_cached_monitors.cache_clear()
+        self._ws_resolution_cache = (None, {}, {})
+        self._workspace_state_dirty = True
+
+# FreeRDP stderr classification; only the timeout check is case-insensitive
+_RDP_ERROR_RE = re.compile(
+    r'(?P<auth>LOGON_FAILURE|Authentication failed)'
+    r'|(?P<refused>CONNECTION_REFUSED|Connection refused)'
+    r'|(?P<network>NETWORK_ERROR|Network)'
+    r'|(?P<cancelled>CONNECT_CANCELLED)'
+    r'|(?P<timeout>(?i:timeout))'
+)
+_RDP_ERROR_PRIORITY = ('auth', 'refused', 'network', 'cancelled', 'timeout')
+_RDP_ERROR_MESSAGES = {
+    'auth': "Authentication failed - check username/password for {ip}",
+    'refused': "Connection refused by {ip} - RDP service may not be running",
+    'network': "Network error connecting to {ip}",
+    'cancelled': "Connection cancelled - may be due to certificate or policy issues on {ip}",
+    'timeout': "Connection timeout to {ip}",
+}
+
+def _format_duration(seconds: int) -> str:
+    """H:MM:SS for a whole number of seconds"""
+    minutes, secs = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}"
 
 class RDPManager:
     """Optimized RDP connection management"""
@@ -693,33 +1131,192 @@ class RDPManager:
     def __init__(self, hyprland_manager: HyprlandManager):
         self.hyprland = hyprland_manager
         self.active_connections: Dict[str, ConnectionInfo] = {}
-        self._cleanup_thread = None
-        self._start_cleanup_thread()
+        self._connections_lock = threading.Lock()  # Guards active_connections against the exit watcher
+        # One thread waits on pidfds for every connection instead of a thread per process
+        self._exit_selector = selectors.DefaultSelector()
+        self._exit_watcher = None
+        self._exit_watcher_lock = threading.Lock()
+        self._polled_connections: List[Tuple[str, ConnectionInfo]] = []  # Watched without a pidfd
+        self._placement_pool = concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix='rdp-place')  # Window placement jobs
+        self._xfreerdp = None  # Resolved client binary, looked up on first spawn
+        self._rdp_env = self._build_rdp_env()
+    
+    @staticmethod
+    def _build_rdp_env() -> Mapping[str, str]:
+        """Environment for RDP clients with X11 display access, shared read-only by every spawn"""
+        return MappingProxyType({
+            **os.environ,
+            'DISPLAY': ':1',  # Ensure correct display is used
+            'XAUTHORITY': os.environ.get('XAUTHORITY', f'/home/{os.getenv("USER", "nz7")}/.Xauthority'),
+            'XDG_RUNTIME_DIR': f'/run/user/{os.getuid()}',
+        })
     
-    def _start_cleanup_thread(self):
-        """Start background cleanup thread"""
-        def cleanup_loop():
-            while True:
+    def _watch_connection(self, connection_id: str, conn_info: ConnectionInfo):
+        """Get notified as soon as the connection's process exits, draining its output meanwhile"""
+        process = conn_info.process
+        with self._exit_watcher_lock:
+            # Keep the pipes drained so a chatty client never blocks on a full pipe buffer
+            for stream, tail in ((process.stdout, conn_info.stdout_tail), (process.stderr, conn_info.stderr_tail)):
+                if stream is not None:
+                    os.set_blocking(stream.fileno(), False)
+                    self._exit_selector.register(stream, selectors.EVENT_READ, ('pipe', tail))
+            
+            try:
+                pidfd = os.pidfd_open(process.pid)
+                self._exit_selector.register(pidfd, selectors.EVENT_READ, ('exit', connection_id, conn_info))
+            except (AttributeError, OSError):
+                # No pidfd support (non-Linux or kernel < 5.3) - the watcher polls it every tick
+                self._polled_connections.append((connection_id, conn_info))
+            
+            if self._exit_watcher is None:
+                self._exit_watcher = threading.Thread(target=self._exit_watch_loop, daemon=True)
+                self._exit_watcher.start()
+    
+    def _exit_watch_loop(self):
+        """Drain RDP client output and wake when a tracked process exits (its pidfd becomes readable)"""
+        while True:
+            try:
+                # The timeout lets newly registered fds and polled connections be picked up
+                events = self._exit_selector.select(timeout=1)
+            except OSError as e:
+                logger.error(f"Connection exit watcher error: {e}")
+                time.sleep(1)
+                continue
+            
+            exited = []
+            for key, _ in events:
+                if key.data[0] == 'pipe':
+                    self._drain_pipe(key.fileobj, key.data[1])
+                else:
+                    self._exit_selector.unregister(key.fd)
+                    os.close(key.fd)
+                    exited.append(key.data[1:])
+            
+            if self._polled_connections:
+                with self._exit_watcher_lock:
+                    exited.extend(entry for entry in self._polled_connections if entry[1].process.poll() is not None)
+                    self._polled_connections = [entry for entry in self._polled_connections
+                                                if entry[1].process.returncode is None]
+            
+            for connection_id, conn_info in exited:
                 try:
-                    self._cleanup_dead_connections()
-                    time.sleep(30)  # Cleanup every 30 seconds
+                    self._on_connection_exit(connection_id, conn_info)
                 except Exception as e:
-                    logger.error(f"Cleanup thread error: {e}")
-                    time.sleep(60)
+                    logger.error(f"Error handling exit of connection {connection_id}: {e}")
+    
+    def _drain_pipe(self, stream, tail: deque, final: bool = False):
+        """Move whatever is buffered in a client pipe into its bounded tail; close it at EOF"""
+        fd = stream.fileno()
+        while True:
+            try:
+                chunk = os.read(fd, 4096)
+            except BlockingIOError:
+                if not final:
+                    return
+                chunk = b''  # Exited, and anything still holding the pipe open is not ours to wait for
+            if not chunk:
+                self._exit_selector.unregister(stream)
+                stream.close()
+                return
+            tail.append(chunk)
+    
+    def _on_connection_exit(self, connection_id: str, conn_info: ConnectionInfo):
+        """Drop an exited connection from tracking and report why it ended"""
+        process = conn_info.process
+        returncode = process.wait()  # Already exited, reaps immediately
+        conn_info.alive = False
+        
+        # Pick up the last of the output and release the pipes
+        for stream, tail in ((process.stdout, conn_info.stdout_tail), (process.stderr, conn_info.stderr_tail)):
+            if stream is not None and not stream.closed:
+                self._drain_pipe(stream, tail, final=True)
         
-        self._cleanup_thread = threading.Thread(target=cleanup_loop, daemon=True)
-        self._cleanup_thread.start()
+        # Only remove the entry this watcher was started for
+        with self._connections_lock:
+            removed = self.active_connections.get(connection_id) is conn_info
+            if removed:
+                del self.active_connections[connection_id]
+        if removed:
+            logger.info(f"Cleaning up dead connection: {connection_id} (exit code {returncode})")
+        
+        if conn_info.status == 'terminating':
+            return  # Killed on request, kill_connection reports it
+        
+        ip = conn_info.ip
+        stdout = b''.join(conn_info.stdout_tail)
+        stderr = b''.join(conn_info.stderr_tail)
+        stdout_str = stdout.decode('utf-8', errors='ignore') if stdout else ""
+        stderr_str = stderr.decode('utf-8', errors='ignore') if stderr else ""
+        
+        logger.info(f"RDP process for {ip} exited with code {returncode}")
+        if stdout_str.strip():
+            logger.info(f"RDP stdout for {ip}: {stdout_str.strip()[:500]}")
+        if stderr_str.strip():
+            logger.info(f"RDP stderr for {ip}: {stderr_str.strip()[:500]}")
+        
+        if returncode != 0:
+            # Connection failed - parse detailed error
+            error_msg = "Connection failed"
+            if stderr_str:
+                # One scan collects every error kind present; the first in priority order wins
+                found = {match.lastgroup for match in _RDP_ERROR_RE.finditer(stderr_str)}
+                kind = next((kind for kind in _RDP_ERROR_PRIORITY if kind in found), None)
+                if kind is not None:
+                    error_msg = _RDP_ERROR_MESSAGES[kind].format(ip=ip)
+                else:
+                    # Include more of the error for debugging
+                    error_msg = f"RDP connection to {ip} failed: {stderr_str.strip()[:300]}"
+            
+            logger.error(f"RDP connection to {ip} failed: {error_msg}")
+        else:
+            logger.info(f"RDP session to {ip} ended normally")
+    
+    def _place_connection_window(self, conn_info: ConnectionInfo):
+        """Position a new connection's window once Hyprland reports it"""
+        ip = conn_info.ip
+        try:
+            # Event-driven wait - returns as soon as the window opens, or when the process dies
+            window_title = f"FreeRDP: {ip}"
+            deadline = time.monotonic() + 10
+            while not self.hyprland.wait_for_window(window_title, timeout=1.0):
+                if not conn_info.alive or time.monotonic() >= deadline:
+                    break
+            if not conn_info.alive:
+                return  # Exit is reported by the exit watcher
+            
+            logger.info(f"RDP connection to {ip} is running successfully")
+            success = self.hyprland.position_window(window_title, conn_info.workspace, conn_info.position, conn_info.geometry)
+            if success:
+                logger.info(f"Window positioned successfully for {ip}")
+            else:
+                # Try alternate window title formats
+                alternate_titles = [
+                    f"{ip} - FreeRDP",
+                    f"RDP - {ip}",
+                    f"FreeRDP ({ip})",
+                    f"192.168.1.{ip.split('.')[-1]} - FreeRDP"  # Try last octet format
+                ]
+                for title in alternate_titles:
+                    success = self.hyprland.position_window(title, conn_info.workspace, conn_info.position, conn_info.geometry)
+                    if success:
+                        logger.info(f"Window positioned successfully for {ip} using title: {title}")
+                        break
+                else:
+                    logger.warning(f"Failed to position window for {ip} - window title may not match expected format")
+        
+        except Exception as e:
+            logger.error(f"Error monitoring connection to {ip}: {e}")
     
     def _cleanup_dead_connections(self):
         """Remove dead connections"""
-        dead_connections = []
-        for conn_id, conn_info in self.active_connections.items():
-            if conn_info.process.poll() is not None:
-                dead_connections.append(conn_id)
+        with self._connections_lock:
+            dead_connections = [conn_id for conn_id, conn_info in self.active_connections.items()
+                                if not conn_info.alive]
+            for conn_id in dead_connections:
+                del self.active_connections[conn_id]
         
         for conn_id in dead_connections:
             logger.info(f"Cleaning up dead connection: {conn_id}")
-            del self.active_connections[conn_id]
     
     def spawn_connection(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Spawn RDP connection with optimization and workspace-aware geometry"""
@@ -767,9 +1364,13 @@ class RDPManager:
             
             logger.info(f"Spawning RDP connection to {ip} ({geometry}, workspace {workspace}) with user {username}")
             
+            # Resolve the client once instead of walking PATH on every spawn
+            if self._xfreerdp is None:
+                self._xfreerdp = shutil.which('xfreerdp')
+            
             # Build optimized FreeRDP command for version 2.11.7
             cmd = [
-                'xfreerdp',
+                self._xfreerdp or 'xfreerdp',
                 f'/v:{ip}',
                 f'/u:{username}',
                 f'/p:{password}',
@@ -804,19 +1405,13 @@ class RDPManager:
             
             # Start connection with better error handling and X11 environment
             try:
-                # Prepare environment with X11 display access
-                rdp_env = os.environ.copy()
-                rdp_env['DISPLAY'] = ':1'  # Ensure correct display is used
-                if 'XAUTHORITY' not in rdp_env:
-                    rdp_env['XAUTHORITY'] = f'/home/{os.getenv("USER", "nz7")}/.Xauthority'
-                rdp_env['XDG_RUNTIME_DIR'] = f'/run/user/{os.getuid()}'
-                
+                rdp_env = self._rdp_env
                 process = subprocess.Popen(
                     cmd,
                     stdout=subprocess.PIPE,
                     stderr=subprocess.PIPE,
                     env=rdp_env,  # Pass environment with correct DISPLAY
-                    preexec_fn=os.setsid  # Create new process group for better cleanup
+                    start_new_session=True  # New process group for cleanup; no preexec_fn keeps the vfork fast path
                 )
                 logger.info(f"RDP process started for {ip} (PID: {process.pid}) with DISPLAY={rdp_env.get('DISPLAY')}")
             except OSError as e:
@@ -824,7 +1419,9 @@ class RDPManager:
                 return {'success': False, 'error': f'Failed to start RDP client: {e}'}
             
             # Track connection
-            connection_id = f"rdp_{ip}_{int(time.time())}"
+            # One clock read for both the id and the start time
+            now_ns = time.time_ns()
+            connection_id = f"rdp_{ip}_{now_ns // 1_000_000_000}"
             conn_info = ConnectionInfo(
                 connection_id=connection_id,
                 process=process,
@@ -833,87 +1430,16 @@ class RDPManager:
                 geometry=geometry,
                 workspace=workspace,
                 position=position,
-                started=datetime.now()
+                started=datetime.fromtimestamp(now_ns / 1e9)
             )
             
-            self.active_connections[connection_id] = conn_info
+            with self._connections_lock:
+                self.active_connections[connection_id] = conn_info
+            self._watch_connection(connection_id, conn_info)
             logger.info(f"RDP connection {connection_id} registered and tracking started")
             
-            # Monitor connection status asynchronously
-            def monitor_connection():
-                try:
-                    # Wait briefly for connection to establish or fail - increased timeout
-                    time.sleep(3)  # Increased from 2 to 3 seconds
-                    poll_result = process.poll()
-                    
-                    if poll_result is not None:
-                        # Process has exited, get detailed error information
-                        try:
-                            stdout, stderr = process.communicate(timeout=10)  # Increased timeout
-                            stdout_str = stdout.decode('utf-8', errors='ignore') if stdout else ""
-                            stderr_str = stderr.decode('utf-8', errors='ignore') if stderr else ""
-                            
-                            logger.info(f"RDP process for {ip} exited with code {poll_result}")
-                            if stdout_str.strip():
-                                logger.info(f"RDP stdout for {ip}: {stdout_str.strip()[:500]}")
-                            if stderr_str.strip():
-                                logger.info(f"RDP stderr for {ip}: {stderr_str.strip()[:500]}")
-                            
-                            if poll_result != 0:
-                                # Connection failed - parse detailed error
-                                error_msg = "Connection failed"
-                                if stderr_str:
-                                    if 'LOGON_FAILURE' in stderr_str or 'Authentication failed' in stderr_str:
-                                        error_msg = f"Authentication failed - check username/password for {ip}"
-                                    elif 'CONNECTION_REFUSED' in stderr_str or 'Connection refused' in stderr_str:
-                                        error_msg = f"Connection refused by {ip} - RDP service may not be running"
-                                    elif 'NETWORK_ERROR' in stderr_str or 'Network' in stderr_str:
-                                        error_msg = f"Network error connecting to {ip}"
-                                    elif 'CONNECT_CANCELLED' in stderr_str:
-                                        error_msg = f"Connection cancelled - may be due to certificate or policy issues on {ip}"
-                                    elif 'timeout' in stderr_str.lower():
-                                        error_msg = f"Connection timeout to {ip}"
-                                    else:
-                                        # Include more of the error for debugging
-                                        error_msg = f"RDP connection to {ip} failed: {stderr_str.strip()[:300]}"
-                                
-                                logger.error(f"RDP connection to {ip} failed: {error_msg}")
-                            else:
-                                logger.info(f"RDP connection to {ip} established successfully")
-                        except subprocess.TimeoutExpired:
-                            logger.warning(f"Timeout getting process output for {ip}")
-                            logger.error(f"RDP connection to {ip} failed: Process communication timeout")
-                    else:
-                        # Process is still running - this is good!
-                        logger.info(f"RDP connection to {ip} is running successfully")
-                    
-                    # Position window if process is still running
-                    if process.poll() is None:
-                        time.sleep(2)  # Wait for window to appear
-                        window_title = f"FreeRDP: {ip}"
-                        success = self.hyprland.position_window(window_title, workspace, position, geometry)
-                        if success:
-                            logger.info(f"Window positioned successfully for {ip}")
-                        else:
-                            # Try alternate window title formats
-                            alternate_titles = [
-                                f"{ip} - FreeRDP",
-                                f"RDP - {ip}",
-                                f"FreeRDP ({ip})",
-                                f"192.168.1.{ip.split('.')[-1]} - FreeRDP"  # Try last octet format
-                            ]
-                            for title in alternate_titles:
-                                success = self.hyprland.position_window(title, workspace, position, geometry)
-                                if success:
-                                    logger.info(f"Window positioned successfully for {ip} using title: {title}")
-                                    break
-                            else:
-                                logger.warning(f"Failed to position window for {ip} - window title may not match expected format")
-                    
-                except Exception as e:
-                    logger.error(f"Error monitoring connection to {ip}: {e}")
-            
-            threading.Thread(target=monitor_connection, daemon=True).start()
+            # Exit is reported by the pidfd watcher; placement waits on Hyprland window events
+            self._placement_pool.submit(self._place_connection_window, conn_info)
             
             return {
                 'success': True,
@@ -929,6 +1455,7 @@ class RDPManager:
         """Get active connections with status"""
         self._cleanup_dead_connections()  # Clean before returning
         
+        now = datetime.now()
         return {
             conn_id: {
                 'ip': conn_info.ip,
@@ -937,20 +1464,23 @@ class RDPManager:
                 'workspace': conn_info.workspace,
                 'position': conn_info.position,
                 'started': conn_info.started.isoformat(),
-                'duration': str(datetime.now() - conn_info.started),
-                'status': 'running' if conn_info.process.poll() is None else 'stopped'
+                'duration': _format_duration(int((now - conn_info.started).total_seconds())),
+                'status': 'running' if conn_info.alive else 'stopped'
             }
-            for conn_id, conn_info in self.active_connections.items()
+            for conn_id, conn_info in list(self.active_connections.items())
         }
     
     def kill_connection(self, connection_id: str) -> Dict[str, Any]:
         """Kill specific connection"""
-        if connection_id not in self.active_connections:
+        with self._connections_lock:
+            conn_info = self.active_connections.get(connection_id)
+            if conn_info is not None:
+                conn_info.status = 'terminating'  # Keeps the exit watcher from reporting a failure
+        if conn_info is None:
             logger.warning(f"Attempted to kill non-existent connection: {connection_id}")
             return {'success': False, 'error': 'Connection not found'}
         
         try:
-            conn_info = self.active_connections[connection_id]
             logger.info(f"Terminating RDP connection {connection_id} to {conn_info.ip}")
             
             # Graceful shutdown first
@@ -967,7 +1497,10 @@ class RDPManager:
                     logger.info(f"Connection {connection_id} process already terminated")
                     pass  # Process already dead
             
-            del self.active_connections[connection_id]
+            with self._connections_lock:
+                # The exit watcher may have removed it already, or a respawn reused the id
+                if self.active_connections.get(connection_id) is conn_info:
+                    del self.active_connections[connection_id]
             logger.info(f"Connection {connection_id} removed from tracking")
             return {'success': True, 'message': 'Connection terminated successfully'}
             
@@ -975,9 +1508,34 @@ class RDPManager:
             logger.error(f"Failed to kill connection {connection_id}: {e}")
             return {'success': False, 'error': str(e)}
 
+# Fleet health tiers: (min online, min connectivity, status, color) in tenths of a percent,
+# checked in order. A connectivity threshold of -1 means the tier ignores connectivity.
+_HEALTH_TIERS = (
+    (800, 700, "EXCELLENT", "#00ff88"),
+    (600, 500, "GOOD", "#00d4ff"),
+    (400, -1, "DEGRADED", "#ffb800"),
+    (0, -1, "CRITICAL", "#ff4757"),
+)
+
+# One-slot memo of the current second's ISO timestamp: [epoch_second, formatted]
+_ts_cache = [0, ""]
+
+def _iso_now() -> str:
+    """Current local time as ISO string, formatted at most once per second"""
+    t = int(time.time())
+    if _ts_cache[0] != t:
+        # Benign race: concurrent callers may both format, worst case stale by 1s
+        _ts_cache[1] = datetime.fromtimestamp(t).isoformat()
+        _ts_cache[0] = t
+    return _ts_cache[1]
+
 class MissionControl:
     """Optimized Mission Control with better performance"""
     
+    STATUS_KEYFRAME_INTERVAL = 30  # seconds between full status_update broadcasts
+    FLEET_SCRIPT_TIMEOUT = 90  # seconds a fleet script may run before it is killed (scratchpad is slow)
+    FLEET_QUEUE_TIMEOUT = 15  # seconds a fleet request waits for a free script runner
+    
     def __init__(self):
         self.config_manager = ConfigManager()
         self.network_optimizer = NetworkOptimizer()
@@ -989,6 +1547,15 @@ class MissionControl:
         self._last_status_update = None
         self._status_cache = None
         self._status_cache_duration = timedelta(seconds=3)  # Cache status for 3 seconds
+        self._status_payload = None  # (status dict, JSON bytes, gzip bytes) for the current cache
+        self._fleet_list_payload = None  # (status dict, JSON bytes, gzip bytes, etag) for the /api/fleet/status list view
+        self._status_cache_version = 0  # Bumped every time _status_cache is rebuilt
+        self._validated_cache: Tuple[int, Dict[str, Any]] = (-1, {})
+        self._script_pool = concurrent.futures.ThreadPoolExecutor(max_workers=4)  # Bounded fleet script runners
+        self._dbus = None  # Cached user-bus connection for systemd unit queries
+        self._last_emitted_status = None  # Status last broadcast, deltas are computed against it
+        self._last_keyframe = 0.0
+        self._dbus_lock = threading.Lock()
     
     def start_monitoring(self):
         """Start optimized background monitoring"""
@@ -1014,9 +1581,9 @@ class MissionControl:
                 # Clean up caches periodically
                 self.network_optimizer.cleanup_cache()
                 
-                # Get status and emit to connected clients
+                # Get status and emit only what changed, with a full keyframe every 30s
                 status = self.get_fleet_status()
-                socketio.emit('status_update', status)
+                self._emit_status(status)
                 
                 # Log status summary periodically (every 10th update)
                 if hasattr(self, '_status_update_count'):
@@ -1033,8 +1600,7 @@ class MissionControl:
                 consecutive_errors = 0
                 
                 # Adaptive sleep based on number of connected clients
-                connected_clients = len(socketio.server.manager.rooms.get('/', {}).keys())
-                sleep_time = max(3, 8 - connected_clients)  # 3-8 seconds based on load
+                sleep_time = max(3, 8 - _connected_clients)  # 3-8 seconds based on load
                 time.sleep(sleep_time)
                 
             except Exception as e:
@@ -1051,6 +1617,26 @@ class MissionControl:
         
         logger.info("Background monitoring thread stopped")
     
+    def _emit_status(self, status: Dict[str, Any]):
+        """Broadcast a status_delta of changed VM fields, or a full status_update keyframe"""
+        now = time.monotonic()
+        last = self._last_emitted_status
+        if last is None or now - self._last_keyframe >= self.STATUS_KEYFRAME_INTERVAL:
+            socketio.emit('status_update', status)
+            self._last_keyframe = now
+        elif status is not last:
+            # last_updated changes on every refresh, so it only travels with keyframes
+            delta = {}
+            for vm_name, vm_status in status.items():
+                previous = last.get(vm_name, {})
+                changed = {key: value for key, value in vm_status.items()
+                           if key != 'last_updated' and previous.get(key) != value}
+                if changed:
+                    delta[vm_name] = changed
+            if delta:
+                socketio.emit('status_delta', delta)
+        self._last_emitted_status = status
+    
     def get_fleet_status(self) -> Dict[str, Any]:
         """Get comprehensive fleet status with caching"""
         now = datetime.now()
@@ -1060,52 +1646,165 @@ class MissionControl:
             now - self._last_status_update < self._status_cache_duration):
             return self._status_cache
         
-        # Get all IPs for batch ping
-        fleet_ips = [config.ip for config in self.config_manager.fleet_config.values()]
-        ping_results = self.network_optimizer.ping_multiple(fleet_ips)
-        
-        # Build status for each VM
-        status = {}
-        for vm_name, config in self.config_manager.fleet_config.items():
-            vm_status = {
-                'name': vm_name,
-                'callsign': config.callsign,
-                'ip': config.ip,
-                'geometry': config.geometry,
-                'workspace': config.workspace,
-                'position': config.position,
-                'scratchpad': config.scratchpad,
-                'enabled': config.enabled,
-                'online': ping_results.get(config.ip, False),
-                'rdp_connected': self._check_rdp_service(vm_name),
-                'window_active': self.hyprland_manager.check_window_exists(f"FreeRDP: {config.ip}"),
-                'last_updated': now.isoformat()
-            }
-            status[vm_name] = vm_status
+        names, ips, static_fields = self.config_manager.fleet_columns
+        
+        # One batch ping, one systemd query and one Hyprland snapshot for the whole fleet
+        ping_results = self.network_optimizer.ping_multiple(list(ips))
+        active_units = self._list_active_units()
+        window_titles = self.hyprland_manager.list_window_titles()
+        
+        # Health flags as parallel columns
+        online_col = [ping_results.get(ip, False) for ip in ips]
+        rdp_col = [self._check_rdp_service(name, active_units) for name in names]
+        window_col = [f"FreeRDP: {ip}" in window_titles for ip in ips]
+        
+        last_updated = now.isoformat()
+        status = {
+            name: {**vm_fields, 'online': online, 'rdp_connected': rdp_connected,
+                   'window_active': window_active, 'last_updated': last_updated}
+            for name, vm_fields, online, rdp_connected, window_active
+            in zip(names, static_fields, online_col, rdp_col, window_col)
+        }
         
         # Cache the result
         self._status_cache = status
+        self._status_cache_version += 1
         self._last_status_update = now
         
         return status
     
-    def _check_rdp_service(self, vm_name: str) -> bool:
-        """Check RDP service status with timeout"""
+    def get_fleet_status_payload(self) -> Tuple[bytes, bytes]:
+        """Get fleet status as (JSON bytes, gzip bytes), encoded once per status cache refresh"""
+        status = self.get_fleet_status()
+        payload = self._status_payload
+        if payload is None or payload[0] is not status:
+            body = orjson.dumps(status)
+            payload = (status, body, gzip.compress(body, compresslevel=1))
+            self._status_payload = payload
+        return payload[1], payload[2]
+    
+    def get_fleet_list_payload(self) -> Tuple[bytes, bytes, str]:
+        """Get the Available VMs list view as (JSON bytes, gzip bytes, etag), encoded once per status cache refresh"""
+        status = self.get_fleet_status()
+        payload = self._fleet_list_payload
+        if payload is None or payload[0] is not status:
+            # Built straight into the encoder call and cached as bytes until the next status refresh
+            body = orjson.dumps({
+                'success': True,
+                'fleet': [{
+                    'name': vm_name,
+                    'callsign': vm_info['callsign'],
+                    'ip': vm_info['ip'],
+                    'status': 'ONLINE' if vm_info['online'] else 'OFFLINE',
+                    'connected': vm_info.get('rdp_connected', False),
+                    'geometry': vm_info['geometry'],
+                    'workspace': vm_info['workspace'],
+                    'position': vm_info['position'],
+                    'enabled': vm_info['enabled']
+                } for vm_name, vm_info in status.items()]
+            })
+            payload = (status, body, gzip.compress(body, compresslevel=1), payload_etag(body))
+            self._fleet_list_payload = payload
+        return payload[1], payload[2], payload[3]
+    
+    def _list_active_units_dbus(self) -> Optional[set]:
+        """Active nz7dev-*.service user units via systemd's ListUnitsByPatterns, None if D-Bus is unavailable"""
+        if open_dbus_connection is None:
+            return None
+        with self._dbus_lock:
+            try:
+                if self._dbus is None:
+                    self._dbus = open_dbus_connection(bus='SESSION')
+                msg = new_method_call(_SYSTEMD_MANAGER, 'ListUnitsByPatterns', 'asas',
+                                      (['active'], ['nz7dev-*.service']))
+                reply = unwrap_msg(self._dbus.send_and_get_reply(msg, timeout=3))
+                return {unit[0] for unit in reply[0]}
+            except Exception as e:
+                logger.debug(f"systemd D-Bus query failed, falling back to systemctl: {e}")
+                if self._dbus is not None:
+                    try:
+                        self._dbus.close()
+                    except Exception:
+                        pass
+                    self._dbus = None
+                return None
+    
+    def _list_active_units(self) -> Optional[set]:
+        """Names of active nz7dev-*.service user units, None if systemd could not be queried"""
+        units = self._list_active_units_dbus()
+        if units is not None:
+            return units
+        
+        # Without D-Bus a single list-units call still replaces one systemctl per VM
+        try:
+            result = subprocess.run(
+                ('systemctl', '--user', 'list-units', '--type=service', '--state=active',
+                 '--plain', '--no-legend', 'nz7dev-*.service'),
+                capture_output=True,
+                timeout=3
+            )
+        except (subprocess.TimeoutExpired, FileNotFoundError):
+            return None
+        if result.returncode != 0:
+            return None
+        return {line.split(None, 1)[0].decode() for line in result.stdout.splitlines() if line.strip()}
+    
+    def _check_rdp_service(self, vm_name: str, active_units: Optional[set] = None) -> bool:
+        """Check RDP service status, using a prefetched active-unit set when available"""
+        service_name = f"nz7dev-{vm_name}.service"
+        if active_units is not None:
+            return service_name in active_units
+        
         try:
-            service_name = f"nz7dev-{vm_name}.service"
             result = subprocess.run(
-                ['systemctl', '--user', 'is-active', service_name],
+                ('systemctl', '--user', 'is-active', service_name),
                 capture_output=True,
-                text=True,
                 timeout=3  # Increased timeout for reliability
             )
-            is_active = result.stdout.strip() == 'active'
+            is_active = result.stdout.strip() == b'active'
             if is_active:
                 logger.debug(f"RDP service {service_name} is active")
             return is_active
         except (subprocess.TimeoutExpired, subprocess.CalledProcessError, FileNotFoundError):
             return False
     
+    def _run_fleet_script(self, command: str, cmd: List[str], env: Dict[str, str],
+                          started: threading.Event) -> Dict[str, Any]:
+        """Run a fleet script to completion on a script pool thread"""
+        started.set()
+        try:
+            result = subprocess.run(
+                cmd,
+                capture_output=True,
+                text=True,
+                timeout=self.FLEET_SCRIPT_TIMEOUT,
+                env=env
+            )
+        except subprocess.TimeoutExpired:
+            logger.error(f"Fleet command '{command}' timed out after {self.FLEET_SCRIPT_TIMEOUT} seconds")
+            raise
+        
+        if result.returncode == 0:
+            logger.info(f"Fleet command '{command}' completed successfully")
+            if result.stdout.strip():
+                logger.debug(f"Command output: {result.stdout.strip()[:500]}...")  # Limit log output
+            
+            # Invalidate status cache after successful fleet operation
+            self._status_cache = None
+            self._last_status_update = None
+            logger.info("Fleet status cache invalidated after command execution")
+            
+        else:
+            logger.error(f"Fleet command '{command}' failed with exit code {result.returncode}")
+            if result.stderr.strip():
+                logger.error(f"Command error: {result.stderr.strip()[:500]}...")  # Limit error output
+        
+        return {
+            'success': result.returncode == 0,
+            'output': result.stdout,
+            'error': result.stderr if result.returncode != 0 else None
+        }
+    
     def execute_script_command(self, command: str) -> Dict[str, Any]:
         """Execute nz7dev script with timeout and validation"""
         valid_commands = ['up', 'down', 'morning', 'fastup', 'windows', 'scratchpad']
@@ -1114,7 +1813,7 @@ class MissionControl:
             return {'success': False, 'error': 'Invalid command'}
         
         try:
-            logger.info(f"Executing fleet command: {command} (timeout: 60s)")
+            logger.info(f"Executing fleet command: {command} (timeout: {self.FLEET_SCRIPT_TIMEOUT}s)")
             
             # Add environment variable to prevent GUI service interference
             env = os.environ.copy()
@@ -1128,37 +1827,18 @@ class MissionControl:
                 script_path = self.config_manager.script_path
                 cmd = [script_path, command]
             
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=90,  # Increased timeout for scratchpad operations
-                env=env
-            )
-            
-            if result.returncode == 0:
-                logger.info(f"Fleet command '{command}' completed successfully")
-                if result.stdout.strip():
-                    logger.debug(f"Command output: {result.stdout.strip()[:500]}...")  # Limit log output
-                
-                # Invalidate status cache after successful fleet operation
-                self._status_cache = None
-                self._last_status_update = None
-                logger.info("Fleet status cache invalidated after command execution")
-                
-            else:
-                logger.error(f"Fleet command '{command}' failed with exit code {result.returncode}")
-                if result.stderr.strip():
-                    logger.error(f"Command error: {result.stderr.strip()[:500]}...")  # Limit error output
-            
-            return {
-                'success': result.returncode == 0,
-                'output': result.stdout,
-                'error': result.stderr if result.returncode != 0 else None
-            }
+            # The pool caps concurrent fleet scripts. A request only waits a bounded time for a
+            # free runner; once its script starts, subprocess.run's own timeout bounds the wait,
+            # so the caller always gets the script's real outcome
+            started = threading.Event()
+            future = self._script_pool.submit(self._run_fleet_script, command, cmd, env, started)
+            if not started.wait(self.FLEET_QUEUE_TIMEOUT) and future.cancel():
+                logger.warning(f"Fleet command '{command}' dropped: all script runners busy")
+                return {'success': False, 'error': 'All fleet script runners are busy, try again later',
+                        'busy': True}
+            return future.result()
         except subprocess.TimeoutExpired:
-            logger.error(f"Fleet command '{command}' timed out after 90 seconds")
-            return {'success': False, 'error': 'Command timed out after 90 seconds'}
+            return {'success': False, 'error': f'Command timed out after {self.FLEET_SCRIPT_TIMEOUT} seconds'}
         except FileNotFoundError:
             logger.error(f"Script not found: {script_path if command != 'scratchpad' else './nz7dev_scratchpad_launcher.sh'}")
             return {'success': False, 'error': 'Script not found'}
@@ -1171,43 +1851,47 @@ class MissionControl:
         try:
             status = self.get_fleet_status()
             
-            # Calculate health metrics
-            total_vms = len(status)
-            online_vms = sum(1 for vm_data in status.values() if vm_data.get('online', False))
-            connected_vms = sum(1 for vm_data in status.values() if vm_data.get('rdp_connected', False))
-            window_active_vms = sum(1 for vm_data in status.values() if vm_data.get('window_active', False))
-            
-            # Calculate percentages
-            online_percentage = (online_vms / total_vms * 100) if total_vms > 0 else 0
-            connectivity_percentage = (connected_vms / online_vms * 100) if online_vms > 0 else 0
-            
-            # Determine overall health status
-            if online_percentage >= 80 and connectivity_percentage >= 70:
-                health_status = "EXCELLENT"
-                health_color = "#00ff88"
-            elif online_percentage >= 60 and connectivity_percentage >= 50:
-                health_status = "GOOD"
-                health_color = "#00d4ff"
-            elif online_percentage >= 40:
-                health_status = "DEGRADED"
-                health_color = "#ffb800"
-            else:
-                health_status = "CRITICAL"
-                health_color = "#ff4757"
+            # Reuse the previous validation while the status snapshot is unchanged
+            version = self._status_cache_version
+            cached_version, cached_result = self._validated_cache
+            if version == cached_version:
+                return cached_result
             
-            # Identify problem VMs
-            offline_vms = [vm_data['callsign'] for vm_data in status.values() if not vm_data.get('online', False)]
-            disconnected_vms = [vm_data['callsign'] for vm_data in status.values() 
-                              if vm_data.get('online', False) and not vm_data.get('rdp_connected', False)]
+            # Calculate health metrics and identify problem VMs in one pass
+            total_vms = len(status)
+            online_vms = connected_vms = window_active_vms = 0
+            offline_vms = []
+            disconnected_vms = []
+            for vm_data in status.values():
+                online = vm_data.get('online', False)
+                rdp_connected = vm_data.get('rdp_connected', False)
+                online_vms += online
+                connected_vms += rdp_connected
+                window_active_vms += vm_data.get('window_active', False)
+                if not online:
+                    offline_vms.append(vm_data['callsign'])
+                elif not rdp_connected:
+                    disconnected_vms.append(vm_data['callsign'])
+            
+            # Calculate percentages as integer tenths, rounded half up
+            online_tenths = (online_vms * 2000 + total_vms) // (2 * total_vms) if total_vms > 0 else 0
+            conn_tenths = (connected_vms * 2000 + online_vms) // (2 * online_vms) if online_vms > 0 else 0
+            
+            # Determine overall health status from the first matching tier
+            op, cp = online_tenths, conn_tenths
+            health_status, health_color = next(
+                (status_name, color) for min_online, min_conn, status_name, color in _HEALTH_TIERS
+                if op >= min_online and cp >= min_conn
+            )
             
-            return {
+            result = {
                 'status': 'success',
-                'timestamp': datetime.now().isoformat(),
+                'timestamp': _iso_now(),
                 'fleet_health': {
                     'overall_status': health_status,
                     'health_color': health_color,
-                    'online_percentage': round(online_percentage, 1),
-                    'connectivity_percentage': round(connectivity_percentage, 1)
+                    'online_percentage': online_tenths / 10,
+                    'connectivity_percentage': conn_tenths / 10
                 },
                 'metrics': {
                     'total_vms': total_vms,
@@ -1223,13 +1907,15 @@ class MissionControl:
                 },
                 'fleet_data': status
             }
+            self._validated_cache = (version, result)
+            return result
             
         except Exception as e:
             logger.error(f"Fleet status validation failed: {e}")
             return {
                 'status': 'error',
                 'error': str(e),
-                'timestamp': datetime.now().isoformat()
+                'timestamp': _iso_now()
             }
 
 # Global optimized instance
@@ -1238,24 +1924,76 @@ mission_control = MissionControl()
 # Input validation decorator
 def validate_json(*required_fields):
     """Decorator for JSON input validation"""
+    required = tuple(required_fields)
+    # Built once per route: the happy path is a single C-level subset test against the body's keys
+    required_set = frozenset(required)
+    
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            if not request.is_json:
-                return jsonify({'error': 'Content-Type must be application/json'}), 400
-            
-            data = request.get_json()
-            if not data:
-                return jsonify({'error': 'Invalid JSON'}), 400
-            
-            missing_fields = [field for field in required_fields if field not in data]
-            if missing_fields:
+            # silent=True returns None for both a wrong Content-Type and a bad body
+            data = request.get_json(silent=True)
+            if not data or not isinstance(data, dict):
+                return jsonify({'error': 'Invalid JSON or wrong Content-Type'}), 400
+            
+            if not required_set <= data.keys():
+                # Only the error path walks the fields, keeping the declared order in the message
+                missing_fields = [field for field in required if field not in data]
                 return jsonify({'error': f'Missing required fields: {missing_fields}'}), 400
             
             return f(data, *args, **kwargs)
         return decorated_function
     return decorator
 
+def json_error(message: str, status: int = 500) -> Response:
+    """{'success': false, 'error': message} response, encoded straight to bytes"""
+    return Response(orjson.dumps({'success': False, 'error': message}), status=status, mimetype='application/json')
+
+def payload_etag(body: bytes) -> str:
+    """Short content hash of an encoded payload, for weak ETags"""
+    return hashlib.blake2b(body, digest_size=8).hexdigest()
+
+def cached_json_response(body: bytes, body_gzip: bytes, etag: Optional[str] = None) -> Response:
+    """Build a JSON response from pre-encoded bytes, using the gzip copy when accepted
+    
+    With an etag, a matching If-None-Match turns the response into a bodyless 304.
+    """
+    if 'gzip' in request.headers.get('Accept-Encoding', ''):
+        response = Response(body_gzip, mimetype='application/json')
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response = Response(body, mimetype='application/json')
+    response.headers['Vary'] = 'Accept-Encoding'
+    if etag is not None:
+        response.set_etag(etag, weak=True)
+        response = response.make_conditional(request)
+    return response
+
+COMPRESS_MIN_SIZE = 2048  # Bytes; smaller bodies go out uncompressed
+
+@app.after_request
+def compress_response(response: Response) -> Response:
+    """Compress large JSON bodies that were not already served pre-compressed"""
+    if (response.direct_passthrough or response.is_streamed or
+            response.mimetype != 'application/json' or 'Content-Encoding' in response.headers):
+        return response
+    
+    length = response.content_length
+    if not length or length <= COMPRESS_MIN_SIZE:
+        return response
+    
+    accept_encodings = request.accept_encodings
+    if _ZSTD is not None and 'zstd' in accept_encodings:
+        response.set_data(_ZSTD.compress(response.get_data()))
+        response.headers['Content-Encoding'] = 'zstd'
+    elif 'gzip' in accept_encodings:
+        response.set_data(gzip.compress(response.get_data(), compresslevel=1))
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        return response
+    response.vary.add('Accept-Encoding')
+    return response
+
 # Optimized API Routes
 @app.route('/')
 def index():
@@ -1265,8 +2003,7 @@ def index():
 @app.route('/api/status')
 def api_status():
     """Get fleet status with caching headers"""
-    status = mission_control.get_fleet_status()
-    response = jsonify(status)
+    response = cached_json_response(*mission_control.get_fleet_status_payload())
     response.headers['Cache-Control'] = 'public, max-age=3'  # Allow 3-second caching
     return response
 
@@ -1308,7 +2045,7 @@ def api_kill_connection_by_ip(ip):
             break
     
     if not connection_id:
-        return jsonify({'success': False, 'error': f'No active connection found for {ip}'}), 404
+        return json_error(f'No active connection found for {ip}', 404)
     
     result = mission_control.rdp_manager.kill_connection(connection_id)
     return jsonify(result), 200 if result['success'] else 500
@@ -1323,105 +2060,74 @@ def api_update_vm_config(data, vm_name):
         mission_control._status_cache = None
         return jsonify({'success': True, 'message': 'Configuration updated'})
     else:
-        return jsonify({'success': False, 'error': 'Failed to update configuration'}), 400
+        return json_error('Failed to update configuration', 400)
 
 @app.route('/api/config')
 def api_get_config():
     """Get current configuration"""
-    config = {name: asdict(vm_config) for name, vm_config in mission_control.config_manager.fleet_config.items()}
-    return jsonify(config)
+    config_manager = mission_control.config_manager
+    return cached_json_response(config_manager.serialized_config, config_manager.serialized_config_gzip)
 
 @app.route('/api/fleet/<command>', methods=['POST'])
 def api_fleet_command(command):
     """Execute fleet commands"""
     result = mission_control.execute_script_command(command)
-    return jsonify(result), 200 if result['success'] else 400
+    if result['success']:
+        return jsonify(result), 200
+    return jsonify(result), 503 if result.get('busy') else 400
 
 @app.route('/api/fleet/validate')
 def api_validate_fleet_status():
     """Validate fleet status"""
     result = mission_control.validate_fleet_status()
-    return jsonify(result), 200 if result['status'] == 'success' else 500
+    body = orjson.dumps(result)
+    if result['status'] != 'success':
+        return Response(body, status=500, mimetype='application/json')
+    # Plain bytes body, so compress_response can compress it and repeat polls get a 304
+    response = Response(body, mimetype='application/json')
+    response.set_etag(payload_etag(body), weak=True)
+    return response.make_conditional(request)
 
 @app.route('/api/fleet/status')
 def api_get_fleet_status():
     """Get fleet status for Available VMs display"""
     try:
-        fleet_data = mission_control.get_fleet_status()
-        
-        # Transform data to match expected format for Available VMs
-        fleet_list = []
-        for vm_name, vm_info in fleet_data.items():
-            fleet_list.append({
-                'name': vm_name,
-                'callsign': vm_info['callsign'],
-                'ip': vm_info['ip'],
-                'status': 'ONLINE' if vm_info['online'] else 'OFFLINE',
-                'connected': vm_info.get('rdp_connected', False),
-                'geometry': vm_info['geometry'],
-                'workspace': vm_info['workspace'],
-                'position': vm_info['position'],
-                'enabled': vm_info['enabled']
-            })
-        
-        return jsonify({
-            'success': True,
-            'fleet': fleet_list
-        })
+        return cached_json_response(*mission_control.get_fleet_list_payload())
     except Exception as e:
         logger.error(f"Failed to get fleet status: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+        return json_error(str(e), 500)
 
 @app.route('/api/workspace/resolutions')
 def api_workspace_resolutions():
     """Get workspace resolutions for auto-geometry detection"""
     try:
-        workspace_resolutions = mission_control.hyprland_manager.get_all_workspace_resolutions()
-        
-        formatted_resolutions = {}
-        for workspace, (width, height) in workspace_resolutions.items():
-            formatted_resolutions[f'workspace_{workspace}'] = {
-                'width': width,
-                'height': height,
-                'display_name': f'Auto-detect (WS{workspace}: {width}×{height})'
-            }
-        
-        return jsonify({
-            'success': True,
-            'workspaces': formatted_resolutions,
-            'default_geometry': '1920x1080'
-        })
+        return Response(mission_control.hyprland_manager.get_workspace_resolutions_payload(),
+                        mimetype='application/json')
     except Exception as e:
-        logger.error(f"Failed to get workspace resolutions: {e}")
+        logger.error("Failed to get workspace resolutions: %s", e)
         return jsonify({
             'success': False,
             'error': str(e),
             'fallback_resolution': '1920x1040'
         }), 500
 
+# Constant bodies, encoded once at import
+_WORKSPACE_TEST_BYTES = orjson.dumps({'status': 'workspace API working', 'success': True})
+_NOT_FOUND_BYTES = orjson.dumps({'error': 'Not found'})
+
 @app.route('/api/workspaces/test')
 def workspace_test():
     """Simple test for workspace API"""
-    return jsonify({'status': 'workspace API working', 'success': True})
+    return Response(_WORKSPACE_TEST_BYTES, mimetype='application/json')
 
 @app.route('/api/workspaces/state')
 def get_workspace_state():
     """Get current workspace state including VM assignments and layout"""
     try:
-        workspace_state = mission_control.hyprland_manager.get_workspace_state()
-        return jsonify({
-            'success': True,
-            'workspaces': workspace_state
-        })
+        return cached_json_response(*mission_control.hyprland_manager.get_workspace_state_payload())
     except Exception as e:
-        logger.error(f"Failed to get workspace state: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+        logger.error("Failed to get workspace state: %s", e)
+        return json_error(str(e), 500)
 
 @app.route('/api/workspaces/assign', methods=['POST'])
 @validate_json('vm_ip', 'workspace', 'size_preset')
@@ -1437,10 +2143,7 @@ def assign_vm_to_workspace(data):
         
         # Validate workspace
         if not use_scratchpad and (workspace < 1 or workspace > 10):
-            return jsonify({
-                'success': False,
-                'error': 'Workspace must be between 1 and 10'
-            }), 400
+            return json_error('Workspace must be between 1 and 10', 400)
             
         # Calculate geometry based on preset
         geometry = calculate_geometry_from_preset(workspace, size_preset, custom_geometry)
@@ -1450,10 +2153,7 @@ def assign_vm_to_workspace(data):
         
         # Check if window exists
         if not mission_control.hyprland_manager.check_window_exists(window_title):
-            return jsonify({
-                'success': False,
-                'error': f'VM window {vm_ip} not found. Please ensure the RDP session is active.'
-            }), 404
+            return json_error(f'VM window {vm_ip} not found. Please ensure the RDP session is active.', 404)
         
         # Assign to workspace or scratchpad
         if use_scratchpad:
@@ -1470,17 +2170,51 @@ def assign_vm_to_workspace(data):
                 'message': f'VM {vm_ip} assigned to {"scratchpad" if use_scratchpad else f"workspace {workspace}"} with {size_preset} size'
             })
         else:
-            return jsonify({
-                'success': False,
-                'error': 'Failed to assign VM to workspace'
-            }), 500
+            return json_error('Failed to assign VM to workspace', 500)
             
     except Exception as e:
-        logger.error(f"Failed to assign VM to workspace: {e}")
-        return jsonify({
+        logger.error("Failed to assign VM to workspace: %s", e)
+        return json_error(str(e), 500)
+
+def _plan_assignment(assignment: Dict[str, Any], hyprland_manager: 'HyprlandManager',
+                     ws_resolutions: Dict[int, Tuple[int, int]]) -> Tuple[Dict[str, Any], List[str]]:
+    """Resolve one batch-assign entry into its result stub and Hyprland dispatchers"""
+    get = assignment.get
+    vm_ip = assignment['vm_ip']
+    workspace = get('workspace', 1)
+    size_preset = get('size_preset', 'full')
+    position = get('position', 'center')
+    use_scratchpad = get('use_scratchpad', False)
+    window_title = f"FreeRDP: {vm_ip}"
+    
+    try:
+        geometry = calculate_geometry_from_preset(workspace, size_preset, get('custom_geometry'), ws_resolutions)
+        
+        # Served from the clients snapshot taken once for the whole batch
+        if not hyprland_manager.check_window_exists(window_title):
+            return {
+                'vm_ip': vm_ip,
+                'success': False,
+                'error': 'Window not found'
+            }, []
+        
+        if use_scratchpad:
+            commands = hyprland_manager.scratchpad_commands(window_title, size_preset, position, geometry)
+        else:
+            commands = hyprland_manager.position_commands(window_title, workspace, position, geometry)
+        
+        return {
+            'vm_ip': vm_ip,
+            'success': True,
+            'target': 'scratchpad' if use_scratchpad else f'workspace {workspace}'
+        }, commands
+        
+    except Exception as e:
+        return {
+            'vm_ip': vm_ip,
             'success': False,
             'error': str(e)
-        }), 500
+        }, []
 
 @app.route('/api/workspaces/batch-assign', methods=['POST'])
 @validate_json('assignments')
@@ -1488,52 +2222,32 @@ def batch_assign_vms(data):
     """Batch assign multiple VMs to workspaces"""
     try:
         assignments = data['assignments']
-        results = []
+        hyprland_manager = mission_control.hyprland_manager
         
+        # One clients snapshot resolves every window, then all dispatchers for all
+        # windows go to Hyprland as a single batch request
+        hyprland_manager.get_clients()
+        ws_resolutions = {}  # Each workspace's resolution is looked up once per batch
+        results = []
+        commands = []
+        successful = 0
         for assignment in assignments:
-            vm_ip = assignment['vm_ip']
-            workspace = assignment.get('workspace', 1)
-            size_preset = assignment.get('size_preset', 'full')
-            position = assignment.get('position', 'center')
-            use_scratchpad = assignment.get('use_scratchpad', False)
-            custom_geometry = assignment.get('custom_geometry', None)
-            
-            try:
-                geometry = calculate_geometry_from_preset(workspace, size_preset, custom_geometry)
-                window_title = f"FreeRDP: {vm_ip}"
-                
-                if mission_control.hyprland_manager.check_window_exists(window_title):
-                    if use_scratchpad:
-                        success = mission_control.hyprland_manager.assign_to_scratchpad(window_title, size_preset, position, geometry)
-                    else:
-                        success = mission_control.hyprland_manager.position_window(window_title, workspace, position, geometry)
-                    
-                    results.append({
-                        'vm_ip': vm_ip,
-                        'success': success,
-                        'target': 'scratchpad' if use_scratchpad else f'workspace {workspace}'
-                    })
-                else:
-                    results.append({
-                        'vm_ip': vm_ip,
-                        'success': False,
-                        'error': 'Window not found'
-                    })
-                    
-                # Small delay between assignments for stability
-                time.sleep(0.2)
-                
-            except Exception as e:
-                results.append({
-                    'vm_ip': vm_ip,
-                    'success': False,
-                    'error': str(e)
-                })
+            result, assignment_commands = _plan_assignment(assignment, hyprland_manager, ws_resolutions)
+            results.append(result)
+            commands.extend(assignment_commands)
+            successful += result['success']
+        
+        if commands and not hyprland_manager.batch_dispatch(commands, f"{len(assignments)} batch assignments"):
+            # Hyprland reports errors for the batch as a whole
+            for result in results:
+                if result['success']:
+                    result['success'] = False
+                    result['error'] = 'Hyprland rejected the batch'
+            successful = 0
         
         # Invalidate cache after batch operations
-        mission_control.hyprland_manager.invalidate_workspace_cache()
+        hyprland_manager.invalidate_workspace_cache()
         
-        successful = sum(1 for r in results if r['success'])
         total = len(results)
         
         return jsonify({
@@ -1543,60 +2257,80 @@ def batch_assign_vms(data):
         })
         
     except Exception as e:
-        logger.error(f"Failed to batch assign VMs: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+        logger.error("Failed to batch assign VMs: %s", e)
+        return json_error(str(e), 500)
+
+# Size presets as (width, height) fractions of the workspace resolution
+_PRESET_MULT = {
+    'full': (0.95, 0.95),
+    'half-left': (0.48, 0.95),
+    'half-right': (0.48, 0.95),
+    'half-top': (0.95, 0.47),
+    'half-bottom': (0.95, 0.47),
+    'quarter': (0.48, 0.47),
+    'third': (0.31, 0.95),
+    'two-thirds': (0.63, 0.95),
+}
+
+# Custom geometry as WIDTHxHEIGHT, e.g. "1920x1080"
+_GEOM_RE = re.compile(r'(\d{1,5})x(\d{1,5})')
 
-def calculate_geometry_from_preset(workspace: int, size_preset: str, custom_geometry: str = None) -> str:
-    """Calculate window geometry based on size preset and workspace"""
+def calculate_geometry_from_preset(workspace: int, size_preset: str, custom_geometry: str = None,
+                                   ws_resolutions: Optional[Dict[int, Tuple[int, int]]] = None) -> str:
+    """Calculate window geometry based on size preset and workspace
+    
+    ws_resolutions memoizes workspace resolutions across calls; batch callers pass one
+    dict for the whole batch and it is filled in as workspaces are first seen.
+    """
     try:
-        ws_width, ws_height = mission_control.hyprland_manager.get_workspace_resolution(workspace)
-        
-        # Define size presets
-        presets = {
-            'full': (int(ws_width * 0.95), int(ws_height * 0.95)),
-            'half-left': (int(ws_width * 0.48), int(ws_height * 0.95)),
-            'half-right': (int(ws_width * 0.48), int(ws_height * 0.95)),
-            'half-top': (int(ws_width * 0.95), int(ws_height * 0.47)),
-            'half-bottom': (int(ws_width * 0.95), int(ws_height * 0.47)),
-            'quarter': (int(ws_width * 0.48), int(ws_height * 0.47)),
-            'third': (int(ws_width * 0.31), int(ws_height * 0.95)),
-            'two-thirds': (int(ws_width * 0.63), int(ws_height * 0.95)),
-        }
-        
         if size_preset == 'custom' and custom_geometry:
-            # Parse custom geometry (e.g., "1920x1080")
-            try:
-                width, height = map(int, custom_geometry.split('x'))
-                return f"{width}x{height}"
-            except (ValueError, IndexError):
-                logger.warning(f"Invalid custom geometry: {custom_geometry}, using full preset")
-                size_preset = 'full'
-        
-        if size_preset in presets:
-            width, height = presets[size_preset]
-            return f"{width}x{height}"
+            match = _GEOM_RE.fullmatch(custom_geometry)
+            if match:
+                # int() drops leading zeros, as the previous parse did
+                return f"{int(match.group(1))}x{int(match.group(2))}"
+            logger.warning("Invalid custom geometry: %s, using full preset", custom_geometry)
+            size_preset = 'full'
+        
+        multipliers = _PRESET_MULT.get(size_preset)
+        if multipliers is None:
+            logger.warning("Unknown size preset: %s, using full", size_preset)
+            multipliers = _PRESET_MULT['full']
+        
+        if ws_resolutions is None:
+            ws_width, ws_height = mission_control.hyprland_manager.get_workspace_resolution(workspace)
         else:
-            logger.warning(f"Unknown size preset: {size_preset}, using full")
-            width, height = presets['full']
-            return f"{width}x{height}"
+            resolution = ws_resolutions.get(workspace)
+            if resolution is None:
+                resolution = ws_resolutions[workspace] = mission_control.hyprland_manager.get_workspace_resolution(workspace)
+            ws_width, ws_height = resolution
+        
+        kw, kh = multipliers
+        return f"{int(ws_width * kw)}x{int(ws_height * kh)}"
             
     except Exception as e:
-        logger.error(f"Failed to calculate geometry for preset {size_preset}: {e}")
+        logger.error("Failed to calculate geometry for preset %s: %s", size_preset, e)
         return "1920x1080"  # Fallback
 
+# Connected WebSocket clients, maintained by the connect/disconnect handlers
+_connected_clients = 0
+_connected_clients_lock = threading.Lock()
+
 # Optimized WebSocket handlers
 @socketio.on('connect')
 def handle_connect():
     """Handle WebSocket connection"""
+    global _connected_clients
+    with _connected_clients_lock:
+        _connected_clients += 1
     logger.info(f"Client connected: {request.sid}")
     emit('status_update', mission_control.get_fleet_status())
 
 @socketio.on('disconnect')
 def handle_disconnect():
     """Handle WebSocket disconnection"""
+    global _connected_clients
+    with _connected_clients_lock:
+        _connected_clients = max(_connected_clients - 1, 0)
     logger.info(f"Client disconnected: {request.sid}")
 
 @socketio.on('request_status')
@@ -1607,29 +2341,43 @@ def handle_request_status():
 # Error handlers
 @app.errorhandler(404)
 def not_found(error):
-    return jsonify({'error': 'Not found'}), 404
+    return Response(_NOT_FOUND_BYTES, status=404, mimetype='application/json')
 
 @app.errorhandler(500)
 def internal_error(error):
-    logger.error(f"Internal error: {error}")
+    logger.error("Internal error: %s", error)
     return jsonify({'error': 'Internal server error'}), 500
 
+def _is_service_env() -> bool:
+    """Detect whether we run as the systemd service (production) rather than a dev launch"""
+    return (
+        'INVOCATION_ID' in os.environ  # Set by systemd for every unit invocation
+        or os.environ.get('FLASK_ENV') == 'production'
+        or os.environ.get('FLASK_DEBUG') == '0'
+    )
+
 if __name__ == '__main__':
-    # Create required directories
-    os.makedirs('templates', exist_ok=True)
-    os.makedirs('static/css', exist_ok=True)
-    os.makedirs('static/js', exist_ok=True)
-    
-    # Start optimized monitoring
-    mission_control.start_monitoring()
+    # Create required directories; on every start after the first one stat() each is all it takes
+    for directory in ('templates', 'static/css', 'static/js'):
+        if not os.path.isdir(directory):
+            os.makedirs(directory, exist_ok=True)
     
     print(f'\n🚀 {Fore.GREEN}NZ7DEV Mission Control GUI{Style.RESET_ALL} starting...')
     print(f'📡 Navigate to {Fore.CYAN}http://localhost:5000{Style.RESET_ALL}')
     print(f'🎯 Mission Control interface ready!\n')
     print("⚡ Features: Visual workspace manager, drag-and-drop VM placement, size presets")
     
+    is_service = _is_service_env()
+    if is_service:
+        logger.info("Running in service mode - debugger and reloader disabled")
+    
+    # Start optimized monitoring. With the reloader active this file runs twice: the parent only
+    # watches for changes, so only the serving child (WERKZEUG_RUN_MAIN) polls the fleet
+    if is_service or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        mission_control.start_monitoring()
+    
     try:
-        socketio.run(app, host='0.0.0.0', port=5000, debug=True, allow_unsafe_werkzeug=True)
+        socketio.run(app, host='0.0.0.0', port=5000, debug=not is_service, allow_unsafe_werkzeug=True)
     except KeyboardInterrupt:
         logger.info("Received shutdown signal")
     finally:
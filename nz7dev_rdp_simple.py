@@ -5,38 +5,118 @@ Basic RDP/VNC/SSH session management with machine detection and resolution prese
 """
 
 import os
+import atexit
 import json
+import shutil
 import subprocess
+import tempfile
 import threading
 import time
 import logging
+import queue
 import socket
+import struct
+import select
+import selectors
+import itertools
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass, asdict
-from flask import Flask, render_template, request, jsonify
-import concurrent.futures
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('rdp_manager.log'),
-        logging.StreamHandler()
-    ]
-)
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from dataclasses import dataclass
+from flask import Flask, Response, render_template, request, jsonify
+from flask.json.provider import JSONProvider
+import asyncio
+
+try:
+    import orjson
+except ImportError:  # Optional - ujson or the stdlib encoder is used instead
+    orjson = None
+
+ujson = None
+if orjson is None:
+    try:
+        import ujson
+    except ImportError:  # Neither is installed - the stdlib encoder is used
+        pass
+
+def _dumps(obj) -> bytes:
+    """Compact JSON bytes, via orjson or ujson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    if ujson is not None:
+        return ujson.dumps(obj, escape_forward_slashes=False).encode()
+    return json.dumps(obj, separators=(',', ':')).encode()
+
+# Configure logging: request and scanner threads only enqueue records, a listener
+# thread formats them and does the file/console writes
+_log_handlers = (logging.FileHandler('rdp_manager.log'), logging.StreamHandler())
+for _handler in _log_handlers:
+    _handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+_log_queue = queue.SimpleQueue()
+_log_listener = QueueListener(_log_queue, *_log_handlers)
+_log_listener.start()
+atexit.register(_log_listener.stop)  # Flushes queued records on exit
+
+_queue_handler = QueueHandler(_log_queue)
+_queue_handler.setFormatter(logging.Formatter('%(message)s'))  # Only merges args; the listener adds the rest
+logging.basicConfig(level=logging.INFO, handlers=[_queue_handler])
 logger = logging.getLogger(__name__)
 
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson, so jsonify() and request.get_json() skip the stdlib encoder"""
+    
+    # Same switches as Flask's DefaultJSONProvider, but off regardless of app.debug:
+    # sorted keys and indented output only cost encode time and bytes on the wire
+    sort_keys = False
+    compact = True
+    
+    @property
+    def options(self) -> Optional[int]:
+        option = 0
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if not self.compact:
+            option |= orjson.OPT_INDENT_2
+        return option or None
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, option=self.options).decode()
+    
+    def loads(self, s, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+    
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        # Hand the encoded bytes straight to the response instead of round-tripping through str
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj, option=self.options), mimetype='application/json')
+
+class UjsonProvider(JSONProvider):
+    """Flask JSON provider backed by ujson, for platforms without an orjson wheel"""
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        # ujson output is compact and unsorted already
+        return ujson.dumps(obj, escape_forward_slashes=False)
+    
+    def loads(self, s, **kwargs: Any) -> Any:
+        return ujson.loads(s)
+
 # Flask app setup
 app = Flask(__name__)
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+elif ujson is not None:
+    app.json = UjsonProvider(app)
+else:
+    # The stdlib provider sorts keys always and indents whenever app.run(debug=True) is used
+    app.json.sort_keys = False
+    app.json.compact = True
 app.config['SECRET_KEY'] = 'nz7dev-rdp-manager-2024'
 
 # Standard credentials
 STANDARD_USERNAME = "nz7dev"
 STANDARD_PASSWORD = "lemonlime"
 
-@dataclass
+@dataclass(slots=True)
 class Machine:
     """Machine data with multiple service support"""
     ip: str
@@ -51,15 +131,19 @@ class Machine:
     connection_type: Optional[str] = None
     last_seen: Optional[datetime] = None
 
-@dataclass
+@dataclass(slots=True)
 class ResolutionPreset:
     """Resolution preset data"""
     name: str
     width: int
     height: int
     description: str = ""
+    
+    def to_dict(self) -> Dict[str, object]:
+        """Plain dict of the preset fields - cheaper than asdict()'s recursive copy"""
+        return {"name": self.name, "width": self.width, "height": self.height, "description": self.description}
 
-@dataclass
+@dataclass(slots=True)
 class Connection:
     """Active connection (RDP/VNC/SSH)"""
     connection_id: str
@@ -75,6 +159,9 @@ class ResolutionManager:
     def __init__(self, presets_file: str = "presets.json"):
         self.presets_file = presets_file
         self.presets: Dict[str, ResolutionPreset] = {}
+        self._saved_snapshot: Optional[tuple] = None  # Preset state last written to / read from disk
+        self.version = 0  # Bumped on every add/edit/delete
+        self._presets_payload: Optional[Tuple[int, bytes]] = None  # (version, /api/presets body)
         self.load_presets()
     
     def load_presets(self):
@@ -96,6 +183,7 @@ class ResolutionManager:
                     data = json.load(f)
                     for key, preset_data in data.items():
                         self.presets[key] = ResolutionPreset(**preset_data)
+                self._saved_snapshot = self._snapshot()
                 logger.info(f"Loaded {len(self.presets)} resolution presets")
             else:
                 self.presets = default_presets
@@ -105,12 +193,25 @@ class ResolutionManager:
             logger.error(f"Failed to load presets: {e}")
             self.presets = default_presets
     
+    def _snapshot(self) -> tuple:
+        """Comparable view of the current presets"""
+        return tuple((key, p.name, p.width, p.height, p.description) for key, p in self.presets.items())
+    
     def save_presets(self):
         """Save presets to JSON file"""
         try:
-            data = {key: asdict(preset) for key, preset in self.presets.items()}
-            with open(self.presets_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            snapshot = self._snapshot()
+            if snapshot == self._saved_snapshot:
+                return  # Nothing changed since the last write
+            
+            data = {key: preset.to_dict() for key, preset in self.presets.items()}
+            if orjson is not None:
+                with open(self.presets_file, 'wb') as f:
+                    f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            else:
+                with open(self.presets_file, 'w') as f:
+                    json.dump(data, f, indent=2)
+            self._saved_snapshot = snapshot
             logger.info(f"Saved {len(self.presets)} resolution presets")
         except Exception as e:
             logger.error(f"Failed to save presets: {e}")
@@ -120,6 +221,7 @@ class ResolutionManager:
         try:
             key = name.lower().replace(' ', '_').replace('-', '_')
             self.presets[key] = ResolutionPreset(name, width, height, description)
+            self.version += 1
             self.save_presets()
             logger.info(f"Added resolution preset: {name} ({width}x{height})")
             return True
@@ -132,6 +234,7 @@ class ResolutionManager:
         try:
             if key in self.presets:
                 self.presets[key] = ResolutionPreset(name, width, height, description)
+                self.version += 1
                 self.save_presets()
                 logger.info(f"Updated resolution preset: {key} -> {name} ({width}x{height})")
                 return True
@@ -145,6 +248,7 @@ class ResolutionManager:
         try:
             if key in self.presets:
                 del self.presets[key]
+                self.version += 1
                 self.save_presets()
                 logger.info(f"Deleted resolution preset: {key}")
                 return True
@@ -160,18 +264,100 @@ class ResolutionManager:
     def get_preset(self, key: str) -> Optional[ResolutionPreset]:
         """Get specific resolution preset"""
         return self.presets.get(key)
+    
+    def get_presets_payload(self) -> bytes:
+        """Serialized /api/presets body, rebuilt only after a preset is added, edited or deleted"""
+        version = self.version
+        cached = self._presets_payload
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        
+        body = _dumps({
+            "success": True,
+            "presets": {key: preset.to_dict() for key, preset in self.get_presets().items()}
+        })
+        self._presets_payload = (version, body)
+        return body
+
+def _icmp_checksum(data: bytes) -> int:
+    """RFC 1071 one's-complement checksum"""
+    if len(data) % 2:
+        data += b'\x00'
+    total = sum(struct.unpack(f'!{len(data) // 2}H', data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+def _icmp_echo_packet(seq: int, payload: bytes = b'nz7dev-ping-probe') -> bytes:
+    """Build an ICMP echo request (type 8); the kernel fills in the identifier for datagram sockets"""
+    header = struct.pack('!BBHHH', 8, 0, 0, 0, seq)
+    checksum = _icmp_checksum(header + payload)
+    return struct.pack('!BBHHH', 8, 0, checksum, 0, seq) + payload
 
 class MachineScanner:
     """Scan network for machines with RDP/VNC/SSH enabled"""
     
+    SCAN_PORTS = (3389, 5900, 22)  # RDP, VNC, SSH
+    MAX_CONCURRENT_PROBES = 256  # Open sockets during a sweep, well under the default fd limit
+    HOSTNAME_TTL = 300  # Seconds a resolved reverse-DNS name is reused
+    HOSTNAME_MISS_TTL = 30  # Seconds a failed lookup is reused, so transient DNS errors clear quickly
+    HOSTNAME_TIMEOUT = 2  # Seconds allowed per reverse lookup during a sweep
+    
     def __init__(self, network_base: str = "192.168.1"):
         self.network_base = network_base
         self.machines: Dict[str, Machine] = {}
         self.scan_lock = threading.Lock()
+        self.version = 0  # Bumped whenever the machine list is replaced
+        self.on_change: Optional[Callable[[], None]] = None  # Called after the machine list is replaced
+        self._scan_running = threading.Lock()  # Held while a background scan is in flight
+        self._icmp_local = threading.local()  # One ICMP socket per scanning thread
+        self._icmp_available = True  # Cleared if unprivileged ICMP sockets are not permitted
+        self._icmp_seq = itertools.count(1)
+        self._hostname_cache: Dict[str, Tuple[float, str]] = {}  # ip -> (expiry, hostname)
     
+    def _icmp_socket(self) -> Optional[socket.socket]:
+        """This thread's unprivileged ICMP socket (Linux net.ipv4.ping_group_range), None if not permitted"""
+        sock = getattr(self._icmp_local, 'sock', None)
+        if sock is None and self._icmp_available:
+            try:
+                sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP)
+            except OSError:
+                logger.info("Unprivileged ICMP not permitted, relying on service port probes")
+                self._icmp_available = False
+                return None
+            sock.setblocking(False)
+            self._icmp_local.sock = sock
+        return sock
     
     def ping_host(self, ip: str, timeout: int = 1) -> bool:
         """Ping a host to check if it's online"""
+        sock = self._icmp_socket()
+        if sock is None:
+            # Unprivileged ICMP is off by default (ping_group_range "1 0"); the setuid ping still works
+            return self._ping_subprocess(ip, timeout)
+        
+        seq = next(self._icmp_seq) & 0xFFFF
+        try:
+            sock.sendto(_icmp_echo_packet(seq), (ip, 0))
+        except OSError:
+            return False  # Unroutable
+        
+        # The socket is reused, so skip late replies to earlier pings from this thread
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([sock], [], [], remaining)[0]:
+                return False
+            try:
+                data, addr = sock.recvfrom(1024)
+            except OSError:
+                continue
+            if len(data) >= 8 and data[0] == 0 and addr[0] == ip and struct.unpack('!H', data[6:8])[0] == seq:
+                return True
+    
+    @staticmethod
+    def _ping_subprocess(ip: str, timeout: int = 1) -> bool:
+        """Ping through the system ping binary"""
         try:
             result = subprocess.run(
                 ['ping', '-c', '1', '-W', str(timeout), ip],
@@ -179,7 +365,7 @@ class MachineScanner:
                 timeout=timeout + 0.5
             )
             return result.returncode == 0
-        except (subprocess.TimeoutExpired, subprocess.CalledProcessError):
+        except (subprocess.TimeoutExpired, subprocess.CalledProcessError, FileNotFoundError):
             return False
     
     def check_port(self, ip: str, port: int, timeout: int = 1) -> bool:
@@ -205,13 +391,52 @@ class MachineScanner:
         """Check if SSH port (22) is open"""
         return self.check_port(ip, 22, timeout)
     
+    def _cached_hostname(self, ip: str) -> Optional[str]:
+        """Unexpired cached hostname for an IP, if any"""
+        cached = self._hostname_cache.get(ip)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+        return None
+    
+    def _store_hostname(self, ip: str, hostname: Optional[str]) -> str:
+        """Cache a lookup result (None for a failed lookup) and return the name to show"""
+        if hostname:
+            ttl = self.HOSTNAME_TTL
+        else:
+            hostname = f"Unknown-{ip.split('.')[-1]}"
+            ttl = self.HOSTNAME_MISS_TTL
+        self._hostname_cache[ip] = (time.monotonic() + ttl, hostname)
+        return hostname
+    
     def get_hostname(self, ip: str) -> str:
-        """Get hostname for IP address"""
+        """Get hostname for IP address, cached so rescans don't repeat reverse-DNS lookups"""
+        hostname = self._cached_hostname(ip)
+        if hostname is not None:
+            return hostname
+        
         try:
             hostname = socket.gethostbyaddr(ip)[0]
-            return hostname
         except:
-            return f"Unknown-{ip.split('.')[-1]}"
+            hostname = None
+        return self._store_hostname(ip, hostname)
+    
+    async def _resolve_hostnames_async(self, ips: List[str]) -> List[str]:
+        """Reverse-resolve all IPs concurrently through the event loop's resolver"""
+        loop = asyncio.get_running_loop()
+        
+        async def resolve(ip: str) -> str:
+            hostname = self._cached_hostname(ip)
+            if hostname is not None:
+                return hostname
+            try:
+                # NI_NAMEREQD makes a missing PTR record an error instead of echoing the IP back
+                hostname = (await asyncio.wait_for(
+                    loop.getnameinfo((ip, 0), socket.NI_NAMEREQD), self.HOSTNAME_TIMEOUT))[0]
+            except (OSError, asyncio.TimeoutError):
+                hostname = None
+            return self._store_hostname(ip, hostname)
+        
+        return await asyncio.gather(*(resolve(ip) for ip in ips))
     
     def detect_os_type(self, ip: str, rdp_enabled: bool, vnc_enabled: bool, ssh_enabled: bool) -> str:
         """Detect OS type based on available services"""
@@ -228,75 +453,84 @@ class MachineScanner:
         else:
             return "Unknown"
     
-    def scan_single_host(self, ip: str) -> Optional[Machine]:
-        """Scan a single host for RDP/VNC/SSH"""
-        try:
-            # Check for services first, then ping
-            rdp_enabled = self.check_rdp_port(ip)
-            vnc_enabled = self.check_vnc_port(ip)
-            ssh_enabled = self.check_ssh_port(ip)
-            
-            # Only return if at least one service is available
-            if not rdp_enabled and not vnc_enabled and not ssh_enabled:
-                return None
-            
-            # If we found services, the machine is considered online
-            # even if ping is disabled
-            online = self.ping_host(ip)
-            if not online and (rdp_enabled or vnc_enabled or ssh_enabled):
-                online = True  # Services available = machine is online
-            
-            hostname = self.get_hostname(ip)
-            os_version = self.detect_os_type(ip, rdp_enabled, vnc_enabled, ssh_enabled)
-            
-            return Machine(
-                ip=ip,
-                hostname=hostname,
-                os_version=os_version,
-                online=online,
-                rdp_enabled=rdp_enabled,
-                vnc_enabled=vnc_enabled,
-                ssh_enabled=ssh_enabled,
-                last_seen=datetime.now()
-            )
-        except Exception as e:
-            logger.debug(f"Error scanning {ip}: {e}")
-            return None
+    async def _probe_port_async(self, ip: str, port: int, timeout: float, limit: asyncio.Semaphore) -> bool:
+        """Check if a port is open without tying up a thread"""
+        async with limit:
+            try:
+                _, writer = await asyncio.wait_for(asyncio.open_connection(ip, port), timeout)
+            except (OSError, asyncio.TimeoutError):
+                return False
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+            return True
+    
+    async def _sweep_async(self, ips: List[str], timeout: float) -> Tuple[List[Tuple[str, Tuple[bool, ...]]], List[str]]:
+        """Probe the range, then reverse-resolve the hosts that have a service, all in one loop"""
+        port_flags = await self._probe_hosts_async(ips, timeout)
+        found = [(ip, flags) for ip, flags in zip(ips, port_flags) if any(flags)]
+        hostnames = await self._resolve_hostnames_async([ip for ip, _ in found])
+        return found, hostnames
+    
+    async def _probe_hosts_async(self, ips: List[str], timeout: float) -> List[Tuple[bool, ...]]:
+        """(RDP, VNC, SSH) port flags for every IP, all probes in flight at once"""
+        limit = asyncio.Semaphore(self.MAX_CONCURRENT_PROBES)
+        
+        async def probe_host(ip: str) -> Tuple[bool, ...]:
+            return tuple(await asyncio.gather(*(
+                self._probe_port_async(ip, port, timeout, limit) for port in self.SCAN_PORTS
+            )))
+        
+        return await asyncio.gather(*(probe_host(ip) for ip in ips))
     
     def scan_network(self, start_ip: int = 1, end_ip: int = 254) -> Dict[str, Machine]:
         """Scan network range for machines with RDP/VNC/SSH"""
         logger.info(f"Scanning network {self.network_base}.{start_ip}-{end_ip}")
         
         discovered_machines = {}
+        ips = [f"{self.network_base}.{i}" for i in range(start_ip, end_ip + 1)]
         
-        with concurrent.futures.ThreadPoolExecutor(max_workers=50) as executor:
-            # Submit all scan tasks
-            future_to_ip = {
-                executor.submit(self.scan_single_host, f"{self.network_base}.{i}"): i
-                for i in range(start_ip, end_ip + 1)
-            }
-            
-            # Collect results
-            for future in concurrent.futures.as_completed(future_to_ip):
-                try:
-                    machine = future.result()
-                    if machine and (machine.rdp_enabled or machine.vnc_enabled or machine.ssh_enabled):
-                        discovered_machines[machine.ip] = machine
-                        services = []
-                        if machine.rdp_enabled:
-                            services.append("RDP")
-                        if machine.vnc_enabled:
-                            services.append("VNC")
-                        if machine.ssh_enabled:
-                            services.append("SSH")
-                        logger.info(f"Found machine: {machine.ip} ({machine.hostname}) - {machine.os_version} - {'/'.join(services)}")
-                except Exception as e:
-                    logger.debug(f"Scan error: {e}")
+        # Every port probe for the whole range runs in one event loop, so the sweep
+        # takes about one connect timeout instead of one per batch of worker threads;
+        # reverse lookups for the hosts found then go out together as well
+        try:
+            found, hostnames = asyncio.run(self._sweep_async(ips, timeout=1))
+        except Exception as e:
+            logger.error(f"Scan error: {e}")
+            found, hostnames = [], []
+        
+        # Hosts with an open service port are online whether or not they answer ping
+        now = datetime.now()
+        for (ip, (rdp_enabled, vnc_enabled, ssh_enabled)), hostname in zip(found, hostnames):
+            machine = Machine(
+                ip=ip,
+                hostname=hostname,
+                os_version=self.detect_os_type(ip, rdp_enabled, vnc_enabled, ssh_enabled),
+                online=True,
+                rdp_enabled=rdp_enabled,
+                vnc_enabled=vnc_enabled,
+                ssh_enabled=ssh_enabled,
+                last_seen=now
+            )
+            discovered_machines[ip] = machine
+            services = []
+            if machine.rdp_enabled:
+                services.append("RDP")
+            if machine.vnc_enabled:
+                services.append("VNC")
+            if machine.ssh_enabled:
+                services.append("SSH")
+            logger.info(f"Found machine: {machine.ip} ({machine.hostname}) - {machine.os_version} - {'/'.join(services)}")
         
         with self.scan_lock:
             # Update machines with discovered ones only
             self.machines.clear()
             self.machines.update(discovered_machines)
+            self.version += 1
+        if self.on_change:
+            self.on_change()
         
         logger.info(f"Network scan complete. Found {len(discovered_machines)} machines with RDP/VNC/SSH")
         return discovered_machines.copy()
@@ -308,174 +542,233 @@ class MachineScanner:
     
     def refresh_scan(self):
         """Refresh network scan in background"""
-        threading.Thread(target=self.scan_network, daemon=True).start()
+        # Refreshes that arrive while a sweep is running join it instead of starting another
+        if not self._scan_running.acquire(blocking=False):
+            logger.info("Network scan already in progress")
+            return
+        threading.Thread(target=self._run_scan, name='scan', daemon=True).start()
+    
+    def _run_scan(self):
+        """Background scan body; releases the in-progress guard when done"""
+        try:
+            self.scan_network()
+        finally:
+            self._scan_running.release()
 
 class ConnectionManager:
     """Manage RDP/VNC/SSH connections"""
     
+    SSH_TERMINALS = ('kitty', 'gnome-terminal', 'konsole', 'xterm', 'alacritty')  # In order of preference
+    
+    RDP_CREDENTIALS = (f'/u:{STANDARD_USERNAME}', f'/p:{STANDARD_PASSWORD}')
+    # xfreerdp options per connection method, tried in order (FreeRDP 2.11.7 syntax)
+    RDP_METHOD_OPTIONS = (
+        # Method 1: Standard connection with modern syntax
+        ('/cert:ignore', '+compression', '+clipboard', '/auto-reconnect', '/log-level:ERROR'),
+        # Method 2: Disable NLA (Network Level Authentication)
+        ('/cert:ignore', '+compression', '+clipboard', '/sec:rdp', '/log-level:ERROR'),
+        # Method 3: TLS security only
+        ('/cert:ignore', '+compression', '+clipboard', '/sec:tls', '/log-level:ERROR'),
+        # Method 4: No security (for older systems)
+        ('/cert:ignore', '+clipboard', '/sec:rdp', '/log-level:ERROR'),
+    )
+    
     def __init__(self, resolution_manager: ResolutionManager):
         self.resolution_manager = resolution_manager
         self.active_connections: Dict[str, Connection] = {}
+        self._ip_index: Dict[str, str] = {}  # ip -> connection_id, kept in step with active_connections
+        self.version = 0  # Bumped whenever a connection is added or dropped
+        self.on_change: Optional[Callable[[], None]] = None  # Called after a connection is added or dropped
         self.connection_lock = threading.Lock()
-        self._start_cleanup_thread()
+        # Client availability is looked up on PATH once instead of running `which` per connect
+        self._terminal = next((name for name in self.SSH_TERMINALS if shutil.which(name)), None)
+        self._has_vncviewer = shutil.which('vncviewer') is not None
+        self._rdp_env: Optional[Dict[str, str]] = None  # Set on first RDP connect
+        # Exit notifications: pidfds where the kernel supports them, polling otherwise
+        self._exit_selector = selectors.DefaultSelector()
+        self._exit_watcher_lock = threading.Lock()
+        self._polled_connections: List[Connection] = []
+        # Self-pipe that wakes the watcher out of an untimed select when a connection needs polling
+        self._wakeup_r, self._wakeup_w = os.pipe()
+        os.set_blocking(self._wakeup_r, False)
+        os.set_blocking(self._wakeup_w, False)
+        self._exit_selector.register(self._wakeup_r, selectors.EVENT_READ, None)
+        self._start_exit_watcher()
     
-    def _start_cleanup_thread(self):
-        """Start background cleanup thread"""
-        def cleanup_loop():
-            while True:
-                try:
-                    self._cleanup_dead_connections()
-                    time.sleep(30)
-                except Exception as e:
-                    logger.error(f"Cleanup error: {e}")
-                    time.sleep(60)
-        
-        thread = threading.Thread(target=cleanup_loop, daemon=True)
+    def _start_exit_watcher(self):
+        """Start background thread that drops connections as soon as their process exits"""
+        thread = threading.Thread(target=self._exit_watch_loop, daemon=True)
         thread.start()
     
-    def _cleanup_dead_connections(self):
-        """Remove dead connections"""
+    def _exit_watch_loop(self):
+        """Wait for tracked processes to exit (their pidfd becomes readable)"""
+        while True:
+            try:
+                # Block until a pidfd fires; only connections without pidfd support need a poll tick
+                events = self._exit_selector.select(timeout=1 if self._polled_connections else None)
+            except OSError as e:
+                logger.error(f"Exit watcher error: {e}")
+                time.sleep(1)
+                continue
+            
+            exited = []
+            with self._exit_watcher_lock:
+                for key, _ in events:
+                    if key.data is None:
+                        self._drain_wakeup()
+                        continue
+                    self._exit_selector.unregister(key.fd)
+                    os.close(key.fd)
+                    exited.append(key.data)
+                
+                if self._polled_connections:
+                    exited.extend(conn for conn in self._polled_connections if conn.process.poll() is not None)
+                    self._polled_connections = [conn for conn in self._polled_connections
+                                                if conn.process.returncode is None]
+            
+            for connection in exited:
+                self._cleanup_dead_connection(connection)
+    
+    def _track_connection(self, connection: Connection):
+        """Register a started connection and watch its process for exit"""
         with self.connection_lock:
-            dead_connections = [
-                conn_id for conn_id, conn in self.active_connections.items()
-                if conn.process.poll() is not None
-            ]
+            self.active_connections[connection.connection_id] = connection
+            self._ip_index[connection.ip] = connection.connection_id
+            self.version += 1
+        if self.on_change:
+            self.on_change()
+        
+        with self._exit_watcher_lock:
+            try:
+                pidfd = os.pidfd_open(connection.process.pid)
+                self._exit_selector.register(pidfd, selectors.EVENT_READ, connection)
+            except (AttributeError, OSError):
+                # No pidfd support (non-Linux or kernel < 5.3) - the watcher polls it every tick
+                self._polled_connections.append(connection)
+                try:
+                    os.write(self._wakeup_w, b'\0')
+                except BlockingIOError:
+                    pass  # A wakeup is already pending
+    
+    def _drain_wakeup(self):
+        """Empty the wakeup pipe"""
+        try:
+            while os.read(self._wakeup_r, 4096):
+                pass
+        except BlockingIOError:
+            pass
+    
+    def _cleanup_dead_connection(self, connection: Connection):
+        """Reap an exited connection process and stop tracking it"""
+        # Only this child is reaped - a SIGCHLD/waitpid(-1) reaper would also steal the
+        # exit status of the subprocess.run() calls made elsewhere
+        connection.process.poll()
+        with self.connection_lock:
+            if self.active_connections.get(connection.connection_id) is connection:
+                logger.info(f"Cleaning up dead connection: {connection.connection_id}")
+                self._untrack(connection)
+    
+    def _untrack(self, connection: Connection):
+        """Drop a connection from the tracking tables (caller holds connection_lock)"""
+        if self.active_connections.pop(connection.connection_id, None) is not None:
+            self.version += 1
+            if self.on_change:
+                self.on_change()
+        if self._ip_index.get(connection.ip) == connection.connection_id:
+            del self._ip_index[connection.ip]
+    
+    def _get_rdp_env(self) -> Dict[str, str]:
+        """Environment for RDP clients with X11 display access, built once rather than per method tried"""
+        if self._rdp_env is not None:
+            return self._rdp_env
+        
+        env = os.environ.copy()
+        display_found = True
+        
+        # Try to detect the correct DISPLAY
+        if 'DISPLAY' not in env or not env['DISPLAY']:
+            # Common display values to try
+            possible_displays = [':0', ':1', ':10.0', ':0.0']
+            for display in possible_displays:
+                try:
+                    # Test if display is accessible
+                    test_result = subprocess.run(['xset', '-display', display, 'q'], 
+                                               capture_output=True, timeout=2)
+                    if test_result.returncode == 0:
+                        env['DISPLAY'] = display
+                        logger.info(f"Using DISPLAY={display}")
+                        break
+                except:
+                    continue
             
-            for conn_id in dead_connections:
-                logger.info(f"Cleaning up dead connection: {conn_id}")
-                del self.active_connections[conn_id]
+            # Fallback to :0 if no display found
+            if 'DISPLAY' not in env or not env['DISPLAY']:
+                env['DISPLAY'] = ':0'
+                display_found = False
+                logger.warning("No accessible display found, using fallback DISPLAY=:0")
+        
+        # Set XDG_RUNTIME_DIR if not set
+        if 'XDG_RUNTIME_DIR' not in env:
+            env['XDG_RUNTIME_DIR'] = f'/run/user/{os.getuid()}'
+        
+        # Set XAUTHORITY if not set
+        if 'XAUTHORITY' not in env:
+            user = os.getenv('USER', 'root')
+            env['XAUTHORITY'] = f'/home/{user}/.Xauthority'
+        
+        # A fallback display is not cached, so detection runs again once X is reachable
+        if display_found:
+            self._rdp_env = env
+        return env
     
     def connect_rdp(self, ip: str, resolution_key: str = "full_hd") -> Dict[str, str]:
         """Connect to RDP session using xfreerdp"""
         try:
             # Get resolution
-            presets = self.resolution_manager.get_presets()
-            if resolution_key not in presets:
-                resolution_key = "full_hd"
-            
-            preset = presets[resolution_key]
+            preset = self.resolution_manager.get_preset(resolution_key) or self.resolution_manager.get_preset("full_hd")
             resolution = f"{preset.width}x{preset.height}"
             
             logger.info(f"Connecting to {ip} via RDP with resolution {resolution}")
             
-            # Try multiple RDP connection methods with correct FreeRDP 2.11.7 syntax
+            # Only the target and size vary per connect; each method's options are precomputed
+            size = (f'/w:{preset.width}', f'/h:{preset.height}')
             connection_methods = [
-                # Method 1: Standard connection with modern syntax
-                [
-                    'xfreerdp',
-                    f'/v:{ip}',
-                    f'/u:{STANDARD_USERNAME}',
-                    f'/p:{STANDARD_PASSWORD}',
-                    f'/w:{preset.width}',
-                    f'/h:{preset.height}',
-                    '/cert:ignore',
-                    '+compression',
-                    '+clipboard',
-                    '/auto-reconnect',
-                    '/log-level:ERROR'
-                ],
-                # Method 2: Disable NLA (Network Level Authentication)
-                [
-                    'xfreerdp',
-                    f'/v:{ip}',
-                    f'/u:{STANDARD_USERNAME}',
-                    f'/p:{STANDARD_PASSWORD}',
-                    f'/w:{preset.width}',
-                    f'/h:{preset.height}',
-                    '/cert:ignore',
-                    '+compression',
-                    '+clipboard',
-                    '/sec:rdp',
-                    '/log-level:ERROR'
-                ],
-                # Method 3: TLS security only
-                [
-                    'xfreerdp',
-                    f'/v:{ip}',
-                    f'/u:{STANDARD_USERNAME}',
-                    f'/p:{STANDARD_PASSWORD}',
-                    f'/w:{preset.width}',
-                    f'/h:{preset.height}',
-                    '/cert:ignore',
-                    '+compression',
-                    '+clipboard',
-                    '/sec:tls',
-                    '/log-level:ERROR'
-                ],
-                # Method 4: No security (for older systems)
-                [
-                    'xfreerdp',
-                    f'/v:{ip}',
-                    f'/u:{STANDARD_USERNAME}',
-                    f'/p:{STANDARD_PASSWORD}',
-                    f'/w:{preset.width}',
-                    f'/h:{preset.height}',
-                    '/cert:ignore',
-                    '+clipboard',
-                    '/sec:rdp',
-                    '/log-level:ERROR'
-                ]
+                ['xfreerdp', f'/v:{ip}', *self.RDP_CREDENTIALS, *size, *options]
+                for options in self.RDP_METHOD_OPTIONS
             ]
             
             process = None
             last_error = ""
             
+            env = self._get_rdp_env()
+            logger.info(f"RDP environment: DISPLAY={env.get('DISPLAY')}, USER={env.get('USER')}")
+            
             for i, cmd in enumerate(connection_methods, 1):
                 logger.info(f"Trying RDP connection method {i} to {ip}")
                 try:
-                    # Set up proper environment for X11 GUI applications
-                    env = os.environ.copy()
-                    
-                    # Try to detect the correct DISPLAY
-                    if 'DISPLAY' not in env or not env['DISPLAY']:
-                        # Common display values to try
-                        possible_displays = [':0', ':1', ':10.0', ':0.0']
-                        for display in possible_displays:
-                            try:
-                                # Test if display is accessible
-                                test_result = subprocess.run(['xset', '-display', display, 'q'], 
-                                                           capture_output=True, timeout=2)
-                                if test_result.returncode == 0:
-                                    env['DISPLAY'] = display
-                                    logger.info(f"Using DISPLAY={display}")
-                                    break
-                            except:
-                                continue
+                    # stderr goes to an anonymous temp file rather than a pipe: a surviving client
+                    # can never block on a full pipe, and a failed one's output is still readable
+                    with tempfile.TemporaryFile() as stderr_file:
+                        process = subprocess.Popen(
+                            cmd,
+                            stdout=subprocess.DEVNULL,
+                            stderr=stderr_file,
+                            start_new_session=True,
+                            env=env  # Pass the environment with X11 variables
+                        )
+                        
+                        # Wait to see if connection succeeds - a method that fails fast returns immediately
+                        try:
+                            process.wait(timeout=2)
+                        except subprocess.TimeoutExpired:
+                            # Process is still running, connection likely successful
+                            logger.info(f"RDP connection method {i} succeeded")
+                            break
                         
-                        # Fallback to :0 if no display found
-                        if 'DISPLAY' not in env or not env['DISPLAY']:
-                            env['DISPLAY'] = ':0'
-                            logger.warning("No accessible display found, using fallback DISPLAY=:0")
-                    
-                    # Set XDG_RUNTIME_DIR if not set
-                    if 'XDG_RUNTIME_DIR' not in env:
-                        env['XDG_RUNTIME_DIR'] = f'/run/user/{os.getuid()}'
-                    
-                    # Set XAUTHORITY if not set
-                    if 'XAUTHORITY' not in env:
-                        user = os.getenv('USER', 'root')
-                        env['XAUTHORITY'] = f'/home/{user}/.Xauthority'
-                    
-                    logger.info(f"RDP environment: DISPLAY={env.get('DISPLAY')}, USER={env.get('USER')}")
-                    
-                    process = subprocess.Popen(
-                        cmd,
-                        stdout=subprocess.DEVNULL,
-                        stderr=subprocess.PIPE,
-                        start_new_session=True,
-                        env=env  # Pass the environment with X11 variables
-                    )
-                    
-                    # Wait to see if connection succeeds
-                    time.sleep(2)
-                    if process.poll() is None:
-                        # Process is still running, connection likely successful
-                        logger.info(f"RDP connection method {i} succeeded")
-                        break
-                    else:
                         # Process exited, connection failed
-                        _, stderr = process.communicate()
-                        last_error = stderr.decode() if stderr else f"Method {i} failed"
+                        stderr_file.seek(0)
+                        stderr = stderr_file.read()
+                        last_error = stderr.decode(errors='replace') if stderr else f"Method {i} failed"
                         logger.warning(f"RDP connection method {i} failed: {last_error}")
                         process = None
                         
@@ -498,8 +791,7 @@ class ConnectionManager:
                 started=datetime.now()
             )
             
-            with self.connection_lock:
-                self.active_connections[connection_id] = connection
+            self._track_connection(connection)
             
             logger.info(f"RDP connection started: {connection_id}")
             return {"success": True, "connection_id": connection_id}
@@ -515,29 +807,32 @@ class ConnectionManager:
             
             # Try vncviewer first, then fall back to Remmina
             cmd = None
+            process = None
             
-            # Check if vncviewer is available
-            try:
-                subprocess.run(['which', 'vncviewer'], check=True, capture_output=True)
+            # vncviewer availability is detected once at startup
+            if self._has_vncviewer:
                 cmd = [
                     'vncviewer',
                     f'{ip}:5900',
                     '-passwd',
                     '/dev/stdin'
                 ]
-                # For vncviewer, we need to pass password differently
-                process = subprocess.Popen(
-                    cmd,
-                    stdin=subprocess.PIPE,
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.DEVNULL,
-                    start_new_session=True
-                )
-                # Send password
-                process.stdin.write(f'{STANDARD_PASSWORD}\n'.encode())
-                process.stdin.close()
-                
-            except (subprocess.CalledProcessError, FileNotFoundError):
+                try:
+                    # For vncviewer, we need to pass password differently
+                    process = subprocess.Popen(
+                        cmd,
+                        stdin=subprocess.PIPE,
+                        stdout=subprocess.DEVNULL,
+                        stderr=subprocess.DEVNULL,
+                        start_new_session=True
+                    )
+                    # Send password
+                    process.stdin.write(f'{STANDARD_PASSWORD}\n'.encode())
+                    process.stdin.close()
+                except FileNotFoundError:
+                    process = None  # Removed since startup
+            
+            if process is None:
                 # Fall back to Remmina
                 cmd = [
                     'remmina',
@@ -569,8 +864,7 @@ class ConnectionManager:
                 started=datetime.now()
             )
             
-            with self.connection_lock:
-                self.active_connections[connection_id] = connection
+            self._track_connection(connection)
             
             logger.info(f"VNC connection started: {connection_id}")
             return {"success": True, "connection_id": connection_id}
@@ -602,10 +896,10 @@ class ConnectionManager:
             cmd_used = None
             
             for cmd in terminal_commands:
+                # Only the terminal found on PATH at startup is tried
+                if cmd[0] != self._terminal:
+                    continue
                 try:
-                    # Check if terminal is available
-                    subprocess.run(['which', cmd[0]], check=True, capture_output=True)
-                    
                     # Start SSH process in terminal
                     process = subprocess.Popen(
                         cmd,
@@ -616,7 +910,7 @@ class ConnectionManager:
                     cmd_used = cmd[0]
                     break
                     
-                except (subprocess.CalledProcessError, FileNotFoundError):
+                except FileNotFoundError:
                     continue
             
             if process is None:
@@ -638,8 +932,7 @@ class ConnectionManager:
                 started=datetime.now()
             )
             
-            with self.connection_lock:
-                self.active_connections[connection_id] = connection
+            self._track_connection(connection)
             
             logger.info(f"SSH connection started: {connection_id} using {cmd_used}")
             return {"success": True, "connection_id": connection_id}
@@ -678,24 +971,13 @@ class ConnectionManager:
             
             logger.info(f"Disconnecting from {ip} ({connection.connection_type.upper()})")
             
-            # Kill process
-            try:
-                # First try graceful termination
-                connection.process.terminate()
-                connection.process.wait(timeout=5)
-            except subprocess.TimeoutExpired:
-                try:
-                    # Force kill if graceful termination fails
-                    connection.process.kill()
-                    connection.process.wait(timeout=2)
-                except (subprocess.TimeoutExpired, ProcessLookupError):
-                    pass
-            except ProcessLookupError:
-                pass
-            
             # Remove from tracking
             with self.connection_lock:
-                del self.active_connections[connection.connection_id]
+                # The exit watcher may already have dropped it
+                self._untrack(connection)
+            
+            # A client that ignores SIGTERM would hold the request for up to 5s, so reap it in the background
+            threading.Thread(target=self._reap_process, args=(connection.process,), daemon=True).start()
             
             logger.info(f"Disconnected from {ip}")
             return {"success": True, "message": f"Disconnected from {ip}"}
@@ -704,13 +986,33 @@ class ConnectionManager:
             logger.error(f"Failed to disconnect from {ip}: {e}")
             return {"success": False, "error": str(e)}
     
+    @staticmethod
+    def _reap_process(process: subprocess.Popen):
+        """Terminate a client process, escalating to kill if it does not exit"""
+        try:
+            # First try graceful termination
+            process.terminate()
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            try:
+                # Force kill if graceful termination fails
+                process.kill()
+                process.wait(timeout=2)
+            except (subprocess.TimeoutExpired, ProcessLookupError):
+                pass
+        except ProcessLookupError:
+            pass
+    
     def get_connection_by_ip(self, ip: str) -> Optional[Connection]:
         """Get connection by IP address"""
         with self.connection_lock:
-            for connection in self.active_connections.values():
-                if connection.ip == ip:
-                    return connection
-            return None
+            connection_id = self._ip_index.get(ip)
+            return self.active_connections.get(connection_id) if connection_id else None
+    
+    def get_connections_by_ip(self) -> Dict[str, Connection]:
+        """Get all active connections keyed by IP address"""
+        with self.connection_lock:
+            return {ip: self.active_connections[connection_id] for ip, connection_id in self._ip_index.items()}
     
     def get_active_connections(self) -> Dict[str, Connection]:
         """Get all active connections"""
@@ -725,6 +1027,14 @@ class RemoteApp:
         self.connection_manager = ConnectionManager(self.resolution_manager)
         self.machine_scanner = MachineScanner()
         self.last_scan_time = None
+        self._machines_payload: Optional[Tuple[tuple, bytes]] = None  # (state key, /api/machines body)
+        self._bootstrap_payload: Optional[Tuple[tuple, bytes]] = None  # (state key, /api/bootstrap body)
+        
+        # Machine-list change notifications for /api/machines/stream subscribers
+        self._machines_changed = threading.Condition()
+        self._machines_change_seq = 0
+        self.machine_scanner.on_change = self._notify_machines_changed
+        self.connection_manager.on_change = self._notify_machines_changed
         
         # Initial scan
         self.refresh_machines()
@@ -737,12 +1047,12 @@ class RemoteApp:
     def get_machines_with_status(self) -> List[Dict]:
         """Get machines with connection status"""
         machines = self.machine_scanner.get_machines()
-        active_connections = self.connection_manager.get_active_connections()
+        connections_by_ip = self.connection_manager.get_connections_by_ip()
         
         result = []
         for ip, machine in machines.items():
             # Check if connected
-            connection = next((conn for conn in active_connections.values() if conn.ip == ip), None)
+            connection = connections_by_ip.get(ip)
             connected = connection is not None
             connection_type = connection.connection_type if connection else None
             
@@ -760,25 +1070,90 @@ class RemoteApp:
             })
         
         return result
+    
+    def get_machines_payload(self) -> bytes:
+        """Serialized /api/machines body, rebuilt only after a scan completes or a connection changes"""
+        # Read the versions before building so a change mid-build forces a rebuild next time
+        key = (self.machine_scanner.version, self.connection_manager.version, self.last_scan_time)
+        cached = self._machines_payload
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        
+        body = _dumps({
+            "success": True,
+            "machines": self.get_machines_with_status(),
+            "last_scan": self.last_scan_time.isoformat() if self.last_scan_time else None
+        })
+        self._machines_payload = (key, body)
+        return body
+    
+    def _notify_machines_changed(self):
+        """Wake every machine stream so it pushes the new list"""
+        with self._machines_changed:
+            self._machines_change_seq += 1
+            self._machines_changed.notify_all()
+    
+    def stream_machines(self, keepalive: float = 15) -> Iterator[bytes]:
+        """Server-sent events carrying the /api/machines body each time it changes"""
+        seen = -1
+        while True:
+            with self._machines_changed:
+                self._machines_changed.wait_for(lambda: self._machines_change_seq != seen, timeout=keepalive)
+                changed = self._machines_change_seq != seen
+                seen = self._machines_change_seq
+            
+            if changed:
+                yield b'data: ' + self.get_machines_payload() + b'\n\n'
+            else:
+                # Comment line keeps proxies and the browser from timing the stream out
+                yield b': keepalive\n\n'
+    
+    def get_bootstrap_payload(self) -> bytes:
+        """Serialized /api/bootstrap body: machines and presets together for the UI's first load"""
+        key = (self.machine_scanner.version, self.connection_manager.version, self.last_scan_time,
+               self.resolution_manager.version)
+        cached = self._bootstrap_payload
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        
+        body = _dumps({
+            "success": True,
+            "machines": self.get_machines_with_status(),
+            "last_scan": self.last_scan_time.isoformat() if self.last_scan_time else None,
+            "presets": {key: preset.to_dict() for key, preset in self.resolution_manager.get_presets().items()}
+        })
+        self._bootstrap_payload = (key, body)
+        return body
 
 # Global app instance
 remote_app = RemoteApp()
 
 # API Routes
+_index_html: Optional[str] = None  # index.html takes no context, so it is rendered once
+
 @app.route('/')
 def index():
     """Main page"""
-    return render_template('index.html')
+    global _index_html
+    if _index_html is None:
+        _index_html = render_template('index.html')
+    return _index_html
 
 @app.route('/api/machines')
 def api_machines():
     """Get all machines"""
-    machines = remote_app.get_machines_with_status()
-    return jsonify({
-        "success": True,
-        "machines": machines,
-        "last_scan": remote_app.last_scan_time.isoformat() if remote_app.last_scan_time else None
-    })
+    return Response(remote_app.get_machines_payload(), mimetype='application/json')
+
+@app.route('/api/bootstrap')
+def api_bootstrap():
+    """Get machines and presets in one response for the initial page load"""
+    return Response(remote_app.get_bootstrap_payload(), mimetype='application/json')
+
+@app.route('/api/machines/stream')
+def api_machines_stream():
+    """Push the machine list whenever a scan completes or a connection starts or stops"""
+    return Response(remote_app.stream_machines(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache'})
 
 @app.route('/api/machines/refresh', methods=['POST'])
 def api_refresh_machines():
@@ -814,51 +1189,70 @@ def api_disconnect():
 @app.route('/api/presets')
 def api_get_presets():
     """Get resolution presets"""
-    presets = remote_app.resolution_manager.get_presets()
-    return jsonify({
-        "success": True,
-        "presets": {key: asdict(preset) for key, preset in presets.items()}
-    })
+    return Response(remote_app.resolution_manager.get_presets_payload(), mimetype='application/json')
+
+_PRESET_FIELDS = frozenset(('name', 'width', 'height'))
+
+def _preset_size(value) -> Optional[int]:
+    """Positive pixel size from an int or numeric string, None for anything else (bools and floats included)"""
+    # JSON numbers decode to int already; only numeric strings need coercing
+    if type(value) is int:
+        size = value
+    elif isinstance(value, str):
+        try:
+            size = int(value)
+        except ValueError:
+            return None
+    else:
+        return None
+    return size if size > 0 else None
+
+def _parse_preset(data) -> Optional[Tuple[str, int, int, str]]:
+    """(name, width, height, description) from a preset request body, None if it is invalid"""
+    # One C-level subset test instead of a generator over the required keys
+    if not isinstance(data, dict) or not _PRESET_FIELDS <= data.keys():
+        return None
+    
+    name = data['name']
+    description = data.get('description', '')
+    if not isinstance(name, str) or not name.strip() or not isinstance(description, str):
+        return None
+    
+    # A bad size is a bad request rather than a preset xfreerdp would reject
+    width, height = _preset_size(data['width']), _preset_size(data['height'])
+    if width is None or height is None:
+        return None
+    return name, width, height, description
 
 @app.route('/api/presets', methods=['POST'])
 def api_add_preset():
     """Add resolution preset"""
-    data = request.get_json()
-    if not data or not all(key in data for key in ['name', 'width', 'height']):
+    preset = _parse_preset(request.get_json())
+    if preset is None:
         return jsonify({"success": False, "error": "Name, width, and height required"}), 400
     
-    success = remote_app.resolution_manager.add_preset(
-        data['name'],
-        int(data['width']),
-        int(data['height']),
-        data.get('description', '')
-    )
-    
-    return jsonify({"success": success})
+    if not remote_app.resolution_manager.add_preset(*preset):
+        return jsonify({"success": False, "error": "Failed to add preset"}), 400
+    # Success needs no body - the client only checks the status
+    return '', 204
 
 @app.route('/api/presets/<preset_key>', methods=['PUT'])
 def api_edit_preset(preset_key):
     """Edit resolution preset"""
-    data = request.get_json()
-    if not data or not all(key in data for key in ['name', 'width', 'height']):
+    preset = _parse_preset(request.get_json())
+    if preset is None:
         return jsonify({"success": False, "error": "Name, width, and height required"}), 400
     
-    success = remote_app.resolution_manager.edit_preset(
-        preset_key,
-        data['name'],
-        int(data['width']),
-        int(data['height']),
-        data.get('description', '')
-    )
-    
-    return jsonify({"success": success})
+    if not remote_app.resolution_manager.edit_preset(preset_key, *preset):
+        return jsonify({"success": False, "error": "Failed to update preset"}), 400
+    return '', 204
 
 @app.route('/api/presets/<preset_key>', methods=['DELETE'])
 def api_delete_preset(preset_key):
     """Delete a resolution preset"""
     try:
         if remote_app.resolution_manager.delete_preset(preset_key):
-            return jsonify({"success": True, "message": "Preset deleted successfully"})
+            return '', 204
         else:
             return jsonify({"success": False, "message": "Preset not found"}), 404
     except Exception as e:
@@ -922,19 +1316,8 @@ def api_manual_check():
         except socket.error:
             return jsonify({"success": False, "message": "Invalid IP address format"}), 400
         
-        # Check if host is reachable
-        scanner = remote_app.machine_scanner
-        is_online = scanner.ping_host(ip)
-        
-        if not is_online:
-            return jsonify({
-                "success": True,
-                "online": False,
-                "service_available": False,
-                "message": f"Host {ip} is not reachable"
-            })
-        
         # Check the specific service
+        scanner = remote_app.machine_scanner
         service_available = False
         port = None
         
@@ -950,6 +1333,18 @@ def api_manual_check():
         else:
             return jsonify({"success": False, "message": "Invalid protocol"}), 400
         
+        # An open service port already proves the host is up; ping only when it is closed
+        # (ping is ICMP-only now and reports offline where ICMP is blocked or not permitted)
+        is_online = service_available or scanner.ping_host(ip)
+        
+        if not is_online:
+            return jsonify({
+                "success": True,
+                "online": False,
+                "service_available": False,
+                "message": f"Host {ip} is not reachable"
+            })
+        
         # Try to get hostname
         hostname = scanner.get_hostname(ip) or "Unknown"
         
@@ -969,19 +1364,25 @@ def api_manual_check():
         return jsonify({"success": False, "message": f"Check failed: {str(e)}"}), 500
 
 if __name__ == '__main__':
-    # Create templates directory
-    os.makedirs('templates', exist_ok=True)
-    os.makedirs('static/css', exist_ok=True)
-    os.makedirs('static/js', exist_ok=True)
-    
-    print("🚀 NZ7DEV RDP/VNC/SSH Manager starting...")
-    print("📡 Navigate to http://localhost:5001")
-    print("🔑 Using standard credentials: nz7dev/lemonlime")
-    print("🖥️  Supports RDP (xfreerdp), VNC (Remmina), SSH (Kitty)")
-    print("📐 Resolution presets available for RDP connections")
-    print("🔍 Scanning network for RDP/VNC/SSH enabled machines")
+    # Create required directories; on every start after the first one stat() each is all it takes
+    for directory in ('templates', 'static/css', 'static/js'):
+        if not os.path.isdir(directory):
+            os.makedirs(directory, exist_ok=True)
+    
+    # One write for the whole banner
+    print("🚀 NZ7DEV RDP/VNC/SSH Manager starting...\n"
+          "📡 Navigate to http://localhost:5001\n"
+          "🔑 Using standard credentials: nz7dev/lemonlime\n"
+          "🖥️  Supports RDP (xfreerdp), VNC (Remmina), SSH (Kitty)\n"
+          "📐 Resolution presets available for RDP connections\n"
+          "🔍 Scanning network for RDP/VNC/SSH enabled machines")
     
     try:
-        app.run(host='0.0.0.0', port=5001, debug=True)
+        # One thread per request so a slow connect or refresh never queues the UI's polling.
+        # No reloader: its parent process would import the app too and run a second
+        # scanner and exit watcher, besides re-statting every module each second.
+        # The interactive debugger is opt-in (NZ7_DEBUG=1) - it must never face the LAN
+        app.run(host='0.0.0.0', port=5001, debug=os.environ.get('NZ7_DEBUG') == '1',
+                threaded=True, use_reloader=False)
     except KeyboardInterrupt:
         logger.info("Shutting down...") 
\ No newline at end of file
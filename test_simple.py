@@ -3,13 +3,11 @@
 Simple test script for NZ7DEV Remote Manager
 """
 
-import requests
-import json
-import time
-
 def test_api():
     """Test the API endpoints"""
-    base_url = "http://localhost:5001"
+    # In-process test client: no running server, sockets or startup delay needed
+    from nz7dev_rdp_simple import app
+    client = app.test_client()
     
     print("🧪 Testing NZ7DEV Remote Manager API")
     print("=" * 50)
@@ -17,9 +15,9 @@ def test_api():
     # Test 1: Get machines
     print("1. Testing /api/machines endpoint...")
     try:
-        response = requests.get(f"{base_url}/api/machines")
+        response = client.get("/api/machines")
         if response.status_code == 200:
-            data = response.json()
+            data = response.get_json()
             if data['success']:
                 print(f"   ✅ Found {len(data['machines'])} machines")
                 for machine in data['machines']:
@@ -41,9 +39,9 @@ def test_api():
     # Test 2: Get presets
     print("\n2. Testing /api/presets endpoint...")
     try:
-        response = requests.get(f"{base_url}/api/presets")
+        response = client.get("/api/presets")
         if response.status_code == 200:
-            data = response.json()
+            data = response.get_json()
             if data['success']:
                 print(f"   ✅ Found {len(data['presets'])} resolution presets")
                 for key, preset in data['presets'].items():
@@ -64,31 +62,48 @@ def test_api():
             "height": 900,
             "description": "Test preset for API validation"
         }
-        response = requests.post(f"{base_url}/api/presets", json=test_preset)
-        if response.status_code == 200:
-            data = response.json()
-            if data['success']:
-                print("   ✅ Test preset created successfully")
-                
-                # Clean up - delete the test preset
-                response = requests.delete(f"{base_url}/api/presets/test_preset")
-                if response.status_code == 200:
-                    print("   ✅ Test preset cleaned up")
-                else:
-                    print("   ⚠️  Test preset cleanup failed")
+        response = client.post("/api/presets", json=test_preset)
+        if response.status_code == 204:
+            print("   ✅ Test preset created successfully")
+            
+            # Clean up - delete the test preset
+            response = client.delete("/api/presets/test_preset")
+            if response.status_code == 204:
+                print("   ✅ Test preset cleaned up")
             else:
-                print("   ❌ Failed to create test preset")
+                print("   ⚠️  Test preset cleanup failed")
         else:
-            print(f"   ❌ HTTP {response.status_code}")
+            print(f"   ❌ Failed to create test preset (HTTP {response.status_code})")
+    except Exception as e:
+        print(f"   ❌ Error: {e}")
+    
+    # Test 4: Reject invalid presets
+    print("\n4. Testing preset validation...")
+    try:
+        bad_presets = [
+            {"name": None, "width": -5, "height": 0},
+            {"name": "Bool Size", "width": True, "height": 12.9},
+            {"name": "", "width": 1600, "height": 900},
+            {"name": "Text Size", "width": "wide", "height": 900},
+        ]
+        rejected = 0
+        for bad_preset in bad_presets:
+            response = client.post("/api/presets", json=bad_preset)
+            if response.status_code == 400:
+                rejected += 1
+            else:
+                print(f"   ❌ Accepted invalid preset {bad_preset} (HTTP {response.status_code})")
+        if rejected == len(bad_presets):
+            print(f"   ✅ All {rejected} invalid presets rejected")
     except Exception as e:
         print(f"   ❌ Error: {e}")
     
-    # Test 4: Refresh scan
-    print("\n4. Testing network scan refresh...")
+    # Test 5: Refresh scan
+    print("\n5. Testing network scan refresh...")
     try:
-        response = requests.post(f"{base_url}/api/machines/refresh")
+        response = client.post("/api/machines/refresh")
         if response.status_code == 200:
-            data = response.json()
+            data = response.get_json()
             if data['success']:
                 print("   ✅ Network scan refresh initiated")
             else:
@@ -98,8 +113,8 @@ def test_api():
     except Exception as e:
         print(f"   ❌ Error: {e}")
     
-    # Test 5: Connection types simulation
-    print("\n5. Testing connection types (simulation)...")
+    # Test 6: Connection types simulation
+    print("\n6. Testing connection types (simulation)...")
     print("   📋 Supported connection types:")
     print("      • RDP: Windows machines via xfreerdp")
     print("      • VNC: Ubuntu desktop via Remmina")  
@@ -115,7 +130,4 @@ def test_api():
     print("   • UI: Dark mode with service badges")
 
 if __name__ == "__main__":
-    print("Make sure the Remote Manager is running on localhost:5001")
-    print("Starting tests in 3 seconds...")
-    time.sleep(3)
     test_api() 
\ No newline at end of file